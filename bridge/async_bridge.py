@@ -0,0 +1,185 @@
+# project/bridge/async_bridge.py
+import asyncio
+from .base import BaseBridge
+from .clock import VirtualClock, WallClock
+from .policies import FixedBatchPolicy, WaitingTimes
+
+class AsyncBridge(BaseBridge):
+    """
+    Реализация на asyncio, использующая реальное время.
+    Политика та же, что в RealMultiThreadedBridge (по умолчанию батчинг по batch_size),
+    но машины — корутины на одном event loop, а не потоки ОС.
+    У каждого направления своя условная переменная на общем замке,
+    поэтому при передаче моста будится не больше машин нужного направления, чем есть мест.
+    Часы — как у RealMultiThreadedBridge, кроме VirtualClock: корутины спят через clock.async_sleep().
+    """
+
+    def __init__(self, batch_size=5, policy=None, capacity=1, headway=None, crossing_time=1.0, tracer=None,
+                 clock=None):
+        # Часы можно подменить на ScaledClock, чтобы не ждать реальные секунды
+        self.clock = clock or WallClock()
+        if isinstance(self.clock, VirtualClock):
+            raise ValueError("AsyncBridge needs a WallClock or ScaledClock")
+        # tracer: ChromeTracer, которому мост сообщает о законченных партиях
+        self.tracer = tracer
+        self.lock = asyncio.Lock()
+        self.condition_left = asyncio.Condition(self.lock)
+        self.condition_right = asyncio.Condition(self.lock)
+        self.current_direction = None
+        self.on_bridge = 0
+        self.waiting_left = 0
+        self.waiting_right = 0
+
+        self.batch_size = batch_size
+        self.cars_in_current_batch = 0
+        self.batch_started_at = 0.0
+        self.batch_entered_at = 0.0  # въезд первой машины партии
+
+        self.policy = policy or FixedBatchPolicy(batch_size)
+        self.waiting_times = {"left": WaitingTimes(), "right": WaitingTimes()} if self.policy.needs_oldest else None
+
+        # Те же счётчики, что у RealMultiThreadedBridge, чтобы пробуждения можно было сравнить
+        self.wakeups = 0
+        self.futile_wakeups = 0
+        self.waits = 0
+        self.direction_switches = 0
+
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.crossing_time = crossing_time
+        self.headway = crossing_time if headway is None else headway
+        self.next_entry_time = 0.0
+
+    async def enter(self, direction: str, arrival_real_time: float):
+        async with self.lock:
+            waited = not self.may_enter(direction)
+            if waited:
+                self.track_waiting(direction, arrival_real_time, 1)
+            woken = False
+            if direction == "left":
+                while not self.may_enter("left"):
+                    if woken:
+                        self.futile_wakeups += 1
+                    self.waiting_left += 1
+                    self.waits += 1
+                    await self.condition_left.wait()
+                    self.waiting_left -= 1
+                    self.wakeups += 1
+                    woken = True
+            else:  # direction == "right"
+                while not self.may_enter("right"):
+                    if woken:
+                        self.futile_wakeups += 1
+                    self.waiting_right += 1
+                    self.waits += 1
+                    await self.condition_right.wait()
+                    self.waiting_right -= 1
+                    self.wakeups += 1
+                    woken = True
+            if waited:
+                self.track_waiting(direction, arrival_real_time, -1)
+            enter_time = self.take_place(direction, self.clock.time())
+
+        # Хвост колонны выдерживает headway уже вне замка
+        await self.clock.async_sleep(enter_time - self.clock.time())
+        return enter_time
+
+    async def leave(self, enter_time: float):
+        """
+        Проезд занимает crossing_time (1 секунду) по часам моста, но спит корутина, а не поток.
+        """
+        await self.clock.async_sleep(self.crossing_time)
+        leave_time = self.clock.time()
+
+        async with self.lock:
+            self.on_bridge -= 1
+
+            if self.on_bridge == 0:
+                now = self.clock.time()
+                direction = self.policy.next_direction(self, now)
+                if self.tracer is not None and direction != self.current_direction:
+                    self.tracer.batch(self.current_direction, self.batch_entered_at, leave_time,
+                                      self.cars_in_current_batch)
+                if direction is None:
+                    self.current_direction = None
+                    self.cars_in_current_batch = 0
+                elif direction != self.current_direction:
+                    self.switch_to(direction, now)
+                else:
+                    self.wake(direction)
+            elif self.get_waiting(self.current_direction) > 0 and self.admits(self.clock.time()):
+                self.wake(self.current_direction)
+
+        return leave_time
+
+    def snapshot(self):
+        """Снимок счётчиков моста в том же виде, что у RealMultiThreadedBridge (без замеров замка)."""
+        return {
+            "waits": self.waits,
+            "wakeups": self.wakeups,
+            "futile_wakeups": self.futile_wakeups,
+            "direction_switches": self.direction_switches,
+        }
+
+    def switch_to(self, direction: str, now: float):
+        self.direction_switches += 1
+        self.current_direction = direction
+        self.cars_in_current_batch = 0
+        self.batch_started_at = now
+        self.wake(direction)
+
+    def wake(self, direction: str):
+        # Вызывается под self.lock
+        free = self.capacity - self.on_bridge
+        if direction == "left":
+            self.condition_left.notify(free)
+        else:
+            self.condition_right.notify(free)
+
+    def take_place(self, direction: str, now: float) -> float:
+        # Вызывается под self.lock; возвращает момент въезда с учётом headway
+        enter_time = now
+        if self.on_bridge > 0:
+            enter_time = max(now, self.next_entry_time)
+        self.set_direction_if_none(direction, enter_time)
+        if self.cars_in_current_batch == 0:
+            self.batch_entered_at = enter_time
+        self.on_bridge += 1
+        self.cars_in_current_batch += 1
+        self.next_entry_time = enter_time + self.headway
+        return enter_time
+
+    def may_enter(self, direction: str) -> bool:
+        can_enter = self.can_enter_left() if direction == "left" else self.can_enter_right()
+        return can_enter and self.admits(self.clock.time())
+
+    def admits(self, now: float) -> bool:
+        return self.on_bridge == 0 or self.policy.keep_admitting(self, now)
+
+    def get_waiting(self, direction: str) -> int:
+        return self.waiting_left if direction == "left" else self.waiting_right
+
+    def track_waiting(self, direction: str, arrival_time: float, delta: int):
+        if self.waiting_times is not None:
+            if delta > 0:
+                self.waiting_times[direction].add(arrival_time)
+            else:
+                self.waiting_times[direction].remove(arrival_time)
+
+    def oldest_waiting(self, direction: str) -> float:
+        return self.waiting_times[direction].oldest()
+
+    def set_direction_if_none(self, direction: str, now: float = 0.0):
+        if self.current_direction is None:
+            self.current_direction = direction
+            self.cars_in_current_batch = 0
+            self.batch_started_at = now
+
+    def can_enter_left(self):
+        return (self.on_bridge < self.capacity
+            and (self.current_direction is None or self.current_direction == "left"))
+
+    def can_enter_right(self):
+        return (self.on_bridge < self.capacity
+            and (self.current_direction is None or self.current_direction == "right"))
@@ -0,0 +1,154 @@
+# project/bridge/clock.py
+import heapq
+import threading
+import time
+
+
+class WallClock:
+    """
+    Обычные часы: time.monotonic() и time.sleep().
+    Монотонное время не прыгает при подстройке системных часов, поэтому
+    интервалы (ожидание, проезд, расписание прибытий) меряются честно.
+    Через часы идут и ожидания на условных переменных моста, чтобы
+    виртуальные часы знали, какие потоки заблокированы.
+    """
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds: float):
+        """sleep() для корутин (AsyncBridge): засыпает корутина, а не поток с event loop."""
+        import asyncio
+
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def register(self, count: int = 1):
+        """Поток-участник симуляции начал работу (важно только для VirtualClock)."""
+        pass
+
+    def unregister(self):
+        """Поток-участник симуляции закончил работу."""
+        pass
+
+    def wait(self, condition):
+        condition.wait()
+
+    def notify(self, condition, n: int = 1):
+        condition.notify(n)
+
+    def notify_all(self, condition):
+        condition.notify_all()
+
+
+class ScaledClock(WallClock):
+    """
+    Ускоренное время: за одну реальную секунду проходит scale секунд часов.
+    sleep(1.0) при scale=100 спит 10 мс, блокировки при этом остаются настоящими.
+    """
+
+    def __init__(self, scale: float = 100.0):
+        self.scale = scale
+        self.origin = time.monotonic()
+
+    def time(self) -> float:
+        return self.origin + (time.monotonic() - self.origin) * self.scale
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds / self.scale)
+
+    async def async_sleep(self, seconds: float):
+        import asyncio
+
+        if seconds > 0:
+            await asyncio.sleep(seconds / self.scale)
+
+
+class VirtualClock(WallClock):
+    """
+    Полностью виртуальное время. Часы стоят, пока хотя бы один
+    зарегистрированный поток работает, и прыгают к ближайшему пробуждению,
+    как только все потоки заблокированы (в sleep() или в wait() на мосту).
+
+    Потоки, разбуженные notify(), считаются работающими сразу, ещё до того,
+    как они реально проснутся, поэтому время не убегает вперёд раньше них.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._lock = threading.Lock()
+        self._now = start
+        self._active = 0
+        self._blocked = 0
+        self._sleepers = []  # куча (wake_at, seq, event)
+        self._seq = 0
+        self._waiting = {}   # id(condition) -> число ждущих на ней участников
+
+    def time(self) -> float:
+        return self._now
+
+    def register(self, count: int = 1):
+        with self._lock:
+            self._active += count
+
+    def unregister(self):
+        with self._lock:
+            self._active -= 1
+            self._advance()
+
+    def sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        # У каждого спящего своё событие, чтобы сдвиг времени будил только его
+        wakeup = threading.Event()
+        with self._lock:
+            self._seq += 1
+            heapq.heappush(self._sleepers, (self._now + seconds, self._seq, wakeup))
+            self._blocked += 1
+            self._advance()
+        wakeup.wait()
+
+    async def async_sleep(self, seconds: float):
+        # Сдвиг времени держится на учёте заблокированных потоков, а корутины
+        # одного event loop для часов неотличимы от одного работающего потока
+        raise NotImplementedError("VirtualClock works with threads only; use WallClock or ScaledClock with asyncio")
+
+    def wait(self, condition):
+        # Вызывается под замком condition, поэтому notify() не может
+        # проскочить между учётом ожидания и condition.wait()
+        key = id(condition)
+        with self._lock:
+            self._blocked += 1
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+            self._advance()
+        condition.wait()
+
+    def notify(self, condition, n: int = 1):
+        self._release(condition, n)
+        condition.notify(n)
+
+    def notify_all(self, condition):
+        self._release(condition, None)
+        condition.notify_all()
+
+    def _release(self, condition, n):
+        key = id(condition)
+        with self._lock:
+            waiting = self._waiting.get(key, 0)
+            woken = waiting if n is None else min(n, waiting)
+            self._waiting[key] = waiting - woken
+            self._blocked -= woken
+
+    def _advance(self):
+        # Вызывается под self._lock
+        if self._blocked < self._active or not self._sleepers:
+            return
+        self._now = max(self._now, self._sleepers[0][0])
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, wakeup = heapq.heappop(self._sleepers)
+            self._blocked -= 1
+            wakeup.set()
@@ -0,0 +1,89 @@
+# project/bridge/metrics.py
+import threading
+import time
+
+
+class BridgeMetrics:
+    """
+    Замеры замка моста: сколько раз его брали, сколько ждали захвата
+    и сколько держали. Заполняется через TimedLock; все обновления идут,
+    пока замок захвачен, поэтому своя синхронизация не нужна.
+    """
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+    def lock_acquired(self, wait: float):
+        self.acquisitions += 1
+        self.acquire_wait_total += wait
+        if wait > self.acquire_wait_max:
+            self.acquire_wait_max = wait
+
+    def lock_released(self, held: float):
+        self.hold_total += held
+        if held > self.hold_max:
+            self.hold_max = held
+
+    def snapshot(self):
+        """Плоский словарь; времена — в секундах по perf_counter."""
+        n = self.acquisitions
+        return {
+            "lock_acquisitions": n,
+            "lock_acquire_wait_total": self.acquire_wait_total,
+            "lock_acquire_wait_avg": self.acquire_wait_total / n if n else 0.0,
+            "lock_acquire_wait_max": self.acquire_wait_max,
+            "lock_hold_total": self.hold_total,
+            "lock_hold_avg": self.hold_total / n if n else 0.0,
+            "lock_hold_max": self.hold_max,
+        }
+
+
+class TimedLock:
+    """
+    Обёртка над threading.Lock, которая сообщает в BridgeMetrics время
+    ожидания захвата и время удержания. Подходит для threading.Condition:
+    пока поток ждёт на condition.wait(), замок отпущен, и это время
+    не считается удержанием, а повторный захват после пробуждения
+    считается обычным захватом.
+    Мост ставит её вместо обычного замка, только если ему передали metrics,
+    так что без замеров накладных расходов нет.
+    """
+
+    def __init__(self, metrics: BridgeMetrics):
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._owner = None
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            now = time.perf_counter()
+            self._owner = threading.get_ident()
+            self._acquired_at = now
+            self.metrics.lock_acquired(now - start)
+        return acquired
+
+    def release(self):
+        # Замер записываем до освобождения, пока замок ещё наш
+        self.metrics.lock_released(time.perf_counter() - self._acquired_at)
+        self._owner = None
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def _is_owned(self):
+        # Condition спрашивает владельца; без этого метода он проверял бы
+        # замок пробным acquire(), и пробы попадали бы в замеры
+        return self._owner == threading.get_ident()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
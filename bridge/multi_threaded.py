@@ -1,110 +1,423 @@
 #project/bridge/multi_threaded.py
+import math
 import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
 from .base import BaseBridge
+from .metrics import TimedLock
+from .policies import FixedBatchPolicy, WaitingTimes
 
 class MultiThreadedBridge(BaseBridge):
-    def __init__(self, batch_size=5):
-        self.lock = threading.Lock()
+    def __init__(self, batch_size=5, per_direction=False, policy=None,
+                 capacity=1, headway=None, crossing_time=1.0, metrics=None, tracer=None, fifo=False):
+        # metrics: BridgeMetrics, если нужны замеры замка; без них замок обычный
+        self.metrics = metrics
+        # tracer: ChromeTracer, которому мост сообщает о законченных партиях
+        self.tracer = tracer
+        self.lock = TimedLock(metrics) if metrics is not None else threading.Lock()
         self.condition = threading.Condition(self.lock)
+        # per_direction: у каждого направления своя условная переменная,
+        # и при передаче моста будится столько машин нужного направления, сколько есть мест
+        self.per_direction = per_direction
+        if per_direction:
+            self.condition_left = threading.Condition(self.lock)
+            self.condition_right = threading.Condition(self.lock)
+        else:
+            self.condition_left = self.condition_right = self.condition
         self.current_direction = None
         self.on_bridge = 0
         self.waiting_left = 0
         self.waiting_right = 0
+        # Потоки, спящие в enter() на condition_left/condition_right. В событийном движке
+        # waiting_* считают очереди движка, а спящих потоков нет — wake() тогда ничего не будит
+        self.sleepers = 0
 
         self.next_available_time_left = 0.0
         self.next_available_time_right = 0.0
 
         self.batch_size = batch_size
         self.cars_in_current_batch = 0
+        self.batch_started_at = 0.0
+        self.batch_entered_at = 0.0  # въезд первой машины партии
 
-    def enter(self, direction: str, arrival_time: float):
+        # Правило переключения направления; по умолчанию — батчинг по batch_size
+        self.policy = policy or FixedBatchPolicy(batch_size)
+
+        # fifo: въезд строго по билетам в порядке прибытия. Билет выдаёт register();
+        # мост хранит времена прибытия по билетам и считает ожидающих
+        # по логическому времени, а не по тому, какие потоки успели уснуть,
+        # поэтому результат не зависит от планировщика ОС. Будится только
+        # держатель первого билета, и только когда он действительно может въехать.
+        # Выезды тоже идут по логическому порядку (см. wait_turn_to_leave).
+        self.fifo = fifo
+        if fifo:
+            self.tickets = {"left": array("d"), "right": array("d")}  # время прибытия по номеру билета
+            self.next_ticket = {"left": 0, "right": 0}
+            self.parked = {"left": {}, "right": {}}  # билет -> условная переменная спящей машины
+            self.crossing = deque()  # enter_time машин на мосту в порядке въезда
+            self.leave_turn = threading.Condition(self.lock)
+            self.last_leave_time = -math.inf  # логическое время последнего выезда
+        # В режиме fifo самая старая ожидающая машина — держатель первого билета
+        self.waiting_times = {"left": WaitingTimes(), "right": WaitingTimes()} \
+            if self.policy.needs_oldest and not fifo else None
+
+        # Сколько раз ожидающие машины просыпались и сколько из них зря
+        self.wakeups = 0
+        self.futile_wakeups = 0
+        # Сколько раз машины вставали в ожидание и сколько раз мост менял направление
+        self.waits = 0
+        self.direction_switches = 0
+
+        # Колонна: на мосту до capacity машин одного направления, следующая
+        # въезжает не раньше чем через headway после предыдущей.
+        # По умолчанию headway = crossing_time, т.е. машины идут строго по одной.
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.crossing_time = crossing_time
+        self.headway = crossing_time if headway is None else headway
+
+    def enter(self, direction: str, arrival_time: float, ticket: int = None):
+        """
+        Машина ждёт въезда и возвращает enter_time.
+        ticket — билет из register(); нужен только в режиме fifo.
+        """
+        if self.fifo:
+            return self.enter_in_turn(direction, arrival_time, ticket)
         with self.condition:
+            woken = False
             if direction == "left":
                 while True:
-                    if (self.current_direction is None or self.current_direction == "left") and self.can_enter_left():
-                        self.set_direction_if_none("left")
-                        self.on_bridge += 1
-                        enter_time = max(arrival_time, self.next_available_time_left)
+                    enter_time = max(arrival_time, self.next_available_time_left)
+                    if (self.current_direction is None or self.current_direction == "left") and self.can_enter_left() \
+                            and self.admits(enter_time):
+                        self.take_place("left", enter_time)
+                        if woken:
+                            self.track_waiting("left", arrival_time, -1)
                         return enter_time
                     else:
+                        if woken:
+                            self.futile_wakeups += 1
+                        else:
+                            self.track_waiting("left", arrival_time, 1)
                         self.waiting_left += 1
-                        self.condition.wait()
+                        self.waits += 1
+                        self.sleepers += 1
+                        self.condition_left.wait()
+                        self.sleepers -= 1
                         self.waiting_left -= 1
+                        self.wakeups += 1
+                        woken = True
             else:  # direction == "right"
                 while True:
-                    if (self.current_direction is None or self.current_direction == "right") and self.can_enter_right():
-                        self.set_direction_if_none("right")
-                        self.on_bridge += 1
-                        enter_time = max(arrival_time, self.next_available_time_right)
+                    enter_time = max(arrival_time, self.next_available_time_right)
+                    if (self.current_direction is None or self.current_direction == "right") and self.can_enter_right() \
+                            and self.admits(enter_time):
+                        self.take_place("right", enter_time)
+                        if woken:
+                            self.track_waiting("right", arrival_time, -1)
                         return enter_time
                     else:
+                        if woken:
+                            self.futile_wakeups += 1
+                        else:
+                            self.track_waiting("right", arrival_time, 1)
                         self.waiting_right += 1
-                        self.condition.wait()
+                        self.waits += 1
+                        self.sleepers += 1
+                        self.condition_right.wait()
+                        self.sleepers -= 1
                         self.waiting_right -= 1
+                        self.wakeups += 1
+                        woken = True
 
     def leave(self, enter_time: float):
         with self.condition:
-            leave_time = enter_time + 1.0
+            leave_time = enter_time + self.crossing_time
+            if self.fifo:
+                self.wait_turn_to_leave(enter_time, leave_time)
+                self.last_leave_time = leave_time
             self.on_bridge -= 1
+            # Освободилось место: следующая машина заедет не раньше этого момента
+            current = self.current_direction
+            self.set_next_available_time(current, max(self.get_next_available_time(current), leave_time))
+            if self.fifo:
+                self.count_waiting(leave_time)
 
             if self.on_bridge == 0:
-                self.cars_in_current_batch += 1
-
-                if self.current_direction == "left":
-                    self.next_available_time_left = leave_time
-                    if self.cars_in_current_batch >= self.batch_size and self.waiting_right > 0:
-                        self.current_direction = "right"
+                direction = self.policy.next_direction(self, leave_time)
+                if self.tracer is not None and direction != current:
+                    # Партия кончается выездом последней машины; next_available_time включает ещё и headway
+                    self.tracer.batch(current, self.batch_entered_at, leave_time, self.cars_in_current_batch)
+                if direction is None:
+                    # Мост разъехался: кто бы ни приехал следующим, въедет не раньше leave_time.
+                    # В прогоне «поток на машину» встречная машина, прибывшая раньше leave_time,
+                    # но дошедшая до enter() после этого leave(), раньше въезжала в свой arrival_time —
+                    # навстречу ещё едущей машине; теперь она ждёт leave_time
+                    other = "right" if current == "left" else "left"
+                    self.set_next_available_time(other, max(self.get_next_available_time(other), leave_time))
+                    self.current_direction = None
+                    self.cars_in_current_batch = 0
+                else:
+                    if direction != self.current_direction:
+                        self.direction_switches += 1
+                        self.current_direction = direction
                         self.cars_in_current_batch = 0
-                        self.next_available_time_right = leave_time
-                        self.condition.notify_all()
-                    else:
-                        if self.waiting_left == 0 and self.waiting_right == 0:
-                            self.current_direction = None
-                            self.cars_in_current_batch = 0
-                        else:
-
-                            if self.waiting_left > 0:
-                                self.condition.notify_all()
-                            else:
-                                if self.waiting_right > 0:
-                                    self.current_direction = "right"
-                                    self.cars_in_current_batch = 0
-                                    self.next_available_time_right = leave_time
-                                    self.condition.notify_all()
-
-                else:  # current_direction == "right"
-                    self.next_available_time_right = leave_time
-                    if self.cars_in_current_batch >= self.batch_size and self.waiting_left > 0:
-                        self.current_direction = "left"
-                        self.cars_in_current_batch = 0
-                        self.next_available_time_left = leave_time
-                        self.condition.notify_all()
-                    else:
-                        if self.waiting_left == 0 and self.waiting_right == 0:
-                            self.current_direction = None
-                            self.cars_in_current_batch = 0
-                        else:
-                            if self.waiting_right > 0:
-                                self.condition.notify_all()
-                            else:
-                                if self.waiting_left > 0:
-                                    self.current_direction = "left"
-                                    self.cars_in_current_batch = 0
-                                    self.next_available_time_left = leave_time
-                                    self.condition.notify_all()
+                        self.batch_started_at = leave_time
+                        self.set_next_available_time(direction, leave_time)
+                    self.wake(direction)
+            elif self.get_waiting(current) > 0 and self.admits(leave_time):
+                # Колонна продолжается: в освободившееся место может пристроиться ожидающий
+                self.wake(current)
+            if self.fifo:
+                self.hand_off()
+                self.leave_turn.notify_all()
 
             return leave_time
 
-    def set_direction_if_none(self, direction: str):
+    def wait_turn_to_leave(self, enter_time: float, leave_time: float):
+        """
+        Режим fifo: у потоков нет общего логического времени, и поток машины
+        может дойти до leave() раньше, чем по логике въедут машины позади неё.
+        Поэтому выезд ждёт, пока не выедут все въехавшие раньше и не въедет
+        держатель первого билета, если по логике он въезжает до leave_time.
+        """
+        while self.crossing[0] != enter_time or self.head_enters_before(leave_time):
+            self.leave_turn.wait()
+        self.crossing.popleft()
+
+    def head_enters_before(self, leave_time: float) -> bool:
+        # Прибыл ли держатель первого билета текущего направления раньше leave_time
+        # и пускает ли его мост, пока эта машина ещё на нём
+        direction = self.current_direction
+        head = self.next_ticket[direction]
+        return (head < len(self.tickets[direction]) and self.tickets[direction][head] < leave_time
+                and self.ticket_enter_time(direction, head) is not None)
+
+    def register(self, direction: str, arrival_time: float) -> int:
+        """
+        Выдаёт билет машине направления direction (режим fifo).
+        Билеты одного направления выдаются по возрастанию arrival_time,
+        иначе ValueError. Симулятор регистрирует все машины заранее:
+        тогда мост знает, кто уже прибыл к любому логическому моменту.
+        """
+        with self.lock:
+            return self.issue_ticket(direction, arrival_time)
+
+    def issue_ticket(self, direction: str, arrival_time: float) -> int:
+        # Вызывается под self.lock
+        tickets = self.tickets[direction]
+        if tickets and arrival_time < tickets[-1]:
+            raise ValueError("tickets must be issued in arrival order")
+        tickets.append(arrival_time)
+        return len(tickets) - 1
+
+    def enter_in_turn(self, direction: str, arrival_time: float, ticket: int = None):
+        # Въезд в режиме fifo: машина ждёт, пока её билет не станет первым и мост не пустит её
+        with self.lock:
+            if ticket is None:
+                # Без предварительной регистрации порядок — порядок вызовов enter()
+                ticket = self.issue_ticket(direction, arrival_time)
+            waiter = None
+            while True:
+                enter_time = self.ticket_enter_time(direction, ticket)
+                if enter_time is not None:
+                    if waiter is not None:
+                        del self.parked[direction][ticket]
+                    self.take_place(direction, enter_time)
+                    self.next_ticket[direction] += 1
+                    self.crossing.append(enter_time)
+                    # В колонне следом может въехать держатель следующего билета,
+                    # а выезжающие перед ним машины — дождаться его
+                    self.hand_off()
+                    self.leave_turn.notify_all()
+                    return enter_time
+                if waiter is None:
+                    waiter = threading.Condition(self.lock)
+                    self.parked[direction][ticket] = waiter
+                else:
+                    self.futile_wakeups += 1
+                self.waits += 1
+                waiter.wait()
+                self.wakeups += 1
+
+    def ticket_enter_time(self, direction: str, ticket: int):
+        """
+        Момент въезда держателя билета, если он может въехать сейчас, иначе None.
+        Решение принимается так же, как в событийном движке: в момент прибытия
+        машины или, если она уже ждёт, в момент последнего выезда. Выезды,
+        которые по логике случаются раньше этого момента, должны пройти первыми.
+        """
+        if ticket != self.next_ticket[direction] or self.on_bridge >= self.capacity:
+            return None
+        arrival_time = self.tickets[direction][ticket]
+        now = max(arrival_time, self.last_leave_time)
+        if self.crossing and self.crossing[0] + self.crossing_time <= now:
+            return None
+        if self.current_direction is None:
+            # Пустой мост достаётся тому, кто прибыл раньше (при равенстве — левому)
+            other = "right" if direction == "left" else "left"
+            head = self.next_ticket[other]
+            if head < len(self.tickets[other]):
+                other_arrival = self.tickets[other][head]
+                if other_arrival < arrival_time or (other_arrival == arrival_time and other == "left"):
+                    return None
+        elif self.current_direction != direction:
+            return None
+        enter_time = max(arrival_time, self.get_next_available_time(direction))
+        if self.on_bridge > 0:
+            # Ожидающих считаем на момент решения, а не на момент въезда
+            self.count_waiting(now)
+            if not self.policy.keep_admitting(self, enter_time):
+                return None
+        return enter_time
+
+    def hand_off(self):
+        # Вызывается под self.lock; будит только тех держателей первых билетов,
+        # которые уже могут въехать, — не больше одного потока на направление
+        for direction in ("left", "right"):
+            head = self.next_ticket[direction]
+            waiter = self.parked[direction].get(head)
+            if waiter is not None and self.ticket_enter_time(direction, head) is not None:
+                waiter.notify()
+
+    def count_waiting(self, now: float):
+        """
+        Режим fifo: ожидающие — машины с билетом, прибывшие раньше now и ещё не въехавшие.
+        Билеты отсортированы по прибытию, поэтому это двоичный поиск.
+        """
+        for direction in ("left", "right"):
+            head = self.next_ticket[direction]
+            waiting = bisect_left(self.tickets[direction], now, head) - head
+            if direction == "left":
+                self.waiting_left = waiting
+            else:
+                self.waiting_right = waiting
+
+    def try_enter(self, direction: str, arrival_time: float):
+        """
+        Неблокирующая попытка въезда для событийного движка: возвращает
+        enter_time, если машина может заехать прямо сейчас, иначе None.
+        """
+        if self.fifo:
+            raise ValueError("fifo admission is for threaded runs; the event simulator already serves cars in order")
+        with self.lock:
+            if direction == "left":
+                enter_time = max(arrival_time, self.next_available_time_left)
+                if not (self.can_enter_left() and self.admits(enter_time)):
+                    return None
+                self.take_place("left", enter_time)
+                return enter_time
+            else:
+                enter_time = max(arrival_time, self.next_available_time_right)
+                if not (self.can_enter_right() and self.admits(enter_time)):
+                    return None
+                self.take_place("right", enter_time)
+                return enter_time
+
+    def mark_waiting(self, direction: str, delta: int, arrival_time: float = 0.0):
+        """
+        Изменяет счётчик ожидающих машин. Нужен событийному движку,
+        у которого очереди живут вне моста, а не на condition.wait().
+        """
+        with self.lock:
+            if direction == "left":
+                self.waiting_left += delta
+            else:
+                self.waiting_right += delta
+            if delta > 0:
+                self.waits += delta
+            self.track_waiting(direction, arrival_time, delta)
+
+    def track_waiting(self, direction: str, arrival_time: float, delta: int):
+        # Учёт времён прибытия ведём, только если он нужен политике
+        if self.waiting_times is not None:
+            if delta > 0:
+                self.waiting_times[direction].add(arrival_time)
+            else:
+                self.waiting_times[direction].remove(arrival_time)
+
+    def oldest_waiting(self, direction: str) -> float:
+        """Время прибытия самой старой ожидающей машины направления (inf, если таких нет)."""
+        if self.fifo:
+            head = self.next_ticket[direction]
+            tickets = self.tickets[direction]
+            return tickets[head] if head < len(tickets) else math.inf
+        return self.waiting_times[direction].oldest()
+
+    def take_place(self, direction: str, enter_time: float):
+        # Вызывается под self.lock, когда машина въезжает на мост
+        self.set_direction_if_none(direction, enter_time)
+        if self.cars_in_current_batch == 0:
+            self.batch_entered_at = enter_time
+        self.on_bridge += 1
+        self.cars_in_current_batch += 1
+        self.set_next_available_time(direction, enter_time + self.headway)
+
+    def admits(self, now: float) -> bool:
+        """Открыт ли въезд в хвост колонны: на пустой мост решение уже приняла политика."""
+        return self.on_bridge == 0 or self.policy.keep_admitting(self, now)
+
+    def get_waiting(self, direction: str) -> int:
+        return self.waiting_left if direction == "left" else self.waiting_right
+
+    def get_next_available_time(self, direction: str) -> float:
+        return self.next_available_time_left if direction == "left" else self.next_available_time_right
+
+    def set_next_available_time(self, direction: str, value: float):
+        if direction == "left":
+            self.next_available_time_left = value
+        else:
+            self.next_available_time_right = value
+
+    def snapshot(self):
+        """
+        Снимок счётчиков моста: ожидания, пробуждения (в том числе напрасные,
+        после которых машина снова засыпает), смены направления и,
+        если мосту передали metrics, — время захвата и удержания замка.
+        """
+        with self.lock:
+            result = {
+                "waits": self.waits,
+                "wakeups": self.wakeups,
+                "futile_wakeups": self.futile_wakeups,
+                "direction_switches": self.direction_switches,
+            }
+            if self.metrics is not None:
+                result.update(self.metrics.snapshot())
+        return result
+
+    def wake(self, direction: str):
+        """
+        Будит машины, ждущие въезда в направлении direction.
+        В общем режиме будятся все ожидающие, как раньше.
+        """
+        if self.fifo or self.sleepers == 0:
+            # Очередь по билетам: после решения leave() будит hand_off();
+            # без спящих потоков (событийный движок) будить некого
+            return
+        if self.per_direction:
+            # Будим не больше машин, чем свободных мест на мосту
+            free = self.capacity - self.on_bridge
+            if direction == "left":
+                self.condition_left.notify(free)
+            else:
+                self.condition_right.notify(free)
+        else:
+            self.condition.notify_all()
+
+    def set_direction_if_none(self, direction: str, now: float = 0.0):
         if self.current_direction is None:
             self.current_direction = direction
             self.cars_in_current_batch = 0
+            self.batch_started_at = now
 
     def can_enter_left(self):
-        return (self.on_bridge < 1 
+        return (self.on_bridge < self.capacity
             and (self.current_direction is None or self.current_direction == "left"))
 
     def can_enter_right(self):
-        return (self.on_bridge < 1 
+        return (self.on_bridge < self.capacity
             and (self.current_direction is None or self.current_direction == "right"))
 
@@ -0,0 +1,155 @@
+# project/bridge/policies.py
+import heapq
+import math
+from abc import ABC, abstractmethod
+
+
+def opposite(direction: str) -> str:
+    return "right" if direction == "left" else "left"
+
+
+def waiting_counts(bridge):
+    """(ожидающие в текущем направлении, ожидающие в противоположном)."""
+    if bridge.current_direction == "left":
+        return bridge.waiting_left, bridge.waiting_right
+    return bridge.waiting_right, bridge.waiting_left
+
+
+class SwitchingPolicy(ABC):
+    """
+    Правило переключения направления. Мост спрашивает политику каждый раз,
+    когда опустел: next_direction() возвращает направление, которое
+    обслуживать дальше, или None, если ждущих нет. Если на мосту помещается
+    несколько машин, keep_admitting() решает, можно ли ещё пристроиться к колонне.
+
+    Политике доступно состояние моста: current_direction, cars_in_current_batch,
+    batch_started_at, waiting_left / waiting_right и oldest_waiting(direction).
+    Каждое решение — O(1).
+    """
+
+    # True, если политике нужно время прибытия самой старой ожидающей машины.
+    # Только тогда мост ведёт учёт ожидающих по времени прибытия.
+    needs_oldest = False
+
+    def next_direction(self, bridge, now: float):
+        current = bridge.current_direction
+        other = opposite(current)
+        waiting_current, waiting_other = waiting_counts(bridge)
+
+        if waiting_other > 0 and self.should_switch(bridge, now, waiting_current, waiting_other):
+            return other
+        if waiting_current > 0:
+            return current
+        if waiting_other > 0:
+            return other
+        return None
+
+    def keep_admitting(self, bridge, now: float) -> bool:
+        """
+        Пускать ли ещё машины текущего направления вслед колонне, пока мост не пуст.
+        Если политика уже хочет переключиться, въезд закрывается и мост разъезжается.
+        """
+        waiting_current, waiting_other = waiting_counts(bridge)
+        return waiting_other == 0 or not self.should_switch(bridge, now, waiting_current, waiting_other)
+
+    @abstractmethod
+    def should_switch(self, bridge, now: float, waiting_current: int, waiting_other: int) -> bool:
+        """Переключиться ли на другую сторону, когда там есть ожидающие."""
+        pass
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v!r}" for k, v in vars(self).items())
+        return f"{type(self).__name__}({params})"
+
+
+class ExhaustivePolicy(SwitchingPolicy):
+    """Обслуживаем направление, пока его очередь не опустеет."""
+
+    def should_switch(self, bridge, now, waiting_current, waiting_other):
+        return False
+
+
+class FixedBatchPolicy(SwitchingPolicy):
+    """Батчинг: после batch_size въехавших машин переключаемся, если на другой стороне ждут."""
+
+    def __init__(self, batch_size: int = 5):
+        self.batch_size = batch_size
+
+    def should_switch(self, bridge, now, waiting_current, waiting_other):
+        return bridge.cars_in_current_batch >= self.batch_size
+
+
+class TimeSlicePolicy(SwitchingPolicy):
+    """Направлению выделяется time_slice секунд с начала его батча."""
+
+    def __init__(self, time_slice: float = 5.0):
+        self.time_slice = time_slice
+
+    def should_switch(self, bridge, now, waiting_current, waiting_other):
+        return now - bridge.batch_started_at >= self.time_slice
+
+
+class QueueThresholdPolicy(SwitchingPolicy):
+    """Переключаемся, как только на другой стороне скопилось threshold машин."""
+
+    def __init__(self, threshold: int = 5):
+        self.threshold = threshold
+
+    def should_switch(self, bridge, now, waiting_current, waiting_other):
+        return waiting_other >= self.threshold
+
+
+class OldestWaiterAgePolicy(SwitchingPolicy):
+    """Переключаемся, если самая старая машина на другой стороне ждёт дольше max_age."""
+
+    needs_oldest = True
+
+    def __init__(self, max_age: float = 10.0):
+        self.max_age = max_age
+
+    def should_switch(self, bridge, now, waiting_current, waiting_other):
+        return now - bridge.oldest_waiting(opposite(bridge.current_direction)) >= self.max_age
+
+
+class WaitingTimes:
+    """
+    Времена прибытия ожидающих машин одного направления.
+    Машины уходят из ожидания не по порядку, поэтому это куча
+    с ленивым удалением: oldest() — амортизированное O(1).
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.removed = {}
+
+    def add(self, arrival_time: float):
+        heapq.heappush(self.heap, arrival_time)
+
+    def remove(self, arrival_time: float):
+        self.removed[arrival_time] = self.removed.get(arrival_time, 0) + 1
+
+    def oldest(self) -> float:
+        heap = self.heap
+        while heap and self.removed.get(heap[0]):
+            arrival_time = heapq.heappop(heap)
+            self.removed[arrival_time] -= 1
+            if not self.removed[arrival_time]:
+                del self.removed[arrival_time]
+        return heap[0] if heap else math.inf
+
+
+POLICIES = {
+    "exhaustive": ExhaustivePolicy,
+    "fixed_batch": FixedBatchPolicy,
+    "time_slice": TimeSlicePolicy,
+    "queue_threshold": QueueThresholdPolicy,
+    "oldest_waiter": OldestWaiterAgePolicy,
+}
+
+
+def make_policy(name: str, **params) -> SwitchingPolicy:
+    """Политика по имени из POLICIES, например make_policy("time_slice", time_slice=3.0)."""
+    try:
+        return POLICIES[name](**params)
+    except KeyError:
+        raise ValueError(f"Unknown switching policy: {name}") from None
@@ -1,18 +1,36 @@
 # project/bridge/real_multi_threaded.py
 import threading
-import time
 from .base import BaseBridge
+from .clock import WallClock
+from .metrics import TimedLock
+from .policies import FixedBatchPolicy, WaitingTimes
 
 class RealMultiThreadedBridge(BaseBridge):
     """
     Многопоточная реализация, использующая реальное время.
     Допускаем, что мост может находиться только под машинами в одном направлении за раз.
-    Для переключения направления используем батчинг (batch_size), как и в логической версии.
+    Для переключения направления используем политику (policy), как и в логической версии;
+    по умолчанию это батчинг по batch_size. Колонна (capacity, headway) — тоже как там.
     """
 
-    def __init__(self, batch_size=5):
-        self.lock = threading.Lock()
+    def __init__(self, batch_size=5, per_direction=False, clock=None, policy=None,
+                 capacity=1, headway=None, crossing_time=1.0, metrics=None, tracer=None):
+        # Часы можно подменить (ScaledClock, VirtualClock), чтобы не ждать реальные секунды
+        self.clock = clock or WallClock()
+        # metrics: BridgeMetrics, если нужны замеры замка; без них замок обычный
+        self.metrics = metrics
+        # tracer: ChromeTracer, которому мост сообщает о законченных партиях
+        self.tracer = tracer
+        self.lock = TimedLock(metrics) if metrics is not None else threading.Lock()
         self.condition = threading.Condition(self.lock)
+        # per_direction: у каждого направления своя условная переменная,
+        # и при передаче моста будится столько машин нужного направления, сколько есть мест
+        self.per_direction = per_direction
+        if per_direction:
+            self.condition_left = threading.Condition(self.lock)
+            self.condition_right = threading.Condition(self.lock)
+        else:
+            self.condition_left = self.condition_right = self.condition
         self.current_direction = None
         self.on_bridge = 0  # Сколько машин на мосту в данный момент
         self.waiting_left = 0
@@ -20,99 +38,190 @@ class RealMultiThreadedBridge(BaseBridge):
 
         self.batch_size = batch_size
         self.cars_in_current_batch = 0
+        self.batch_started_at = 0.0
+        self.batch_entered_at = 0.0  # въезд первой машины партии
+
+        self.policy = policy or FixedBatchPolicy(batch_size)
+        self.waiting_times = {"left": WaitingTimes(), "right": WaitingTimes()} if self.policy.needs_oldest else None
+
+        # Сколько раз ожидающие машины просыпались и сколько из них зря
+        self.wakeups = 0
+        self.futile_wakeups = 0
+        # Сколько раз машины вставали в ожидание и сколько раз мост менял направление
+        self.waits = 0
+        self.direction_switches = 0
+
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.crossing_time = crossing_time
+        self.headway = crossing_time if headway is None else headway
+        # Раньше этого момента следующая машина колонны въехать не может
+        self.next_entry_time = 0.0
 
     def enter(self, direction: str, arrival_real_time: float):
         """
         Машина пытается попасть на мост. Если текущее направление моста
-        соответствует машине (или мост пуст), и лимит батча не превышен,
+        соответствует машине (или мост пуст), есть место и политика не закрыла въезд,
         машина заезжает. Иначе - ждет на condition.
+        Машина в хвосте колонны дожидается своего headway уже вне замка.
         """
         with self.condition:
+            woken = False
             if direction == "left":
                 while True:
-                    if (self.current_direction in [None, "left"]) and self.can_enter_left():
-                        self.set_direction_if_none("left")
-                        self.on_bridge += 1
-                        enter_time = time.time()  # Момент фактического "въезда"
-                        return enter_time
+                    now = self.clock.time()
+                    if (self.current_direction in [None, "left"]) and self.can_enter_left() and self.admits(now):
+                        enter_time = self.take_place("left", now)  # Момент фактического "въезда"
+                        if woken:
+                            self.track_waiting("left", arrival_real_time, -1)
+                        break
                     else:
+                        if woken:
+                            self.futile_wakeups += 1
+                        else:
+                            self.track_waiting("left", arrival_real_time, 1)
                         self.waiting_left += 1
-                        self.condition.wait()
+                        self.waits += 1
+                        self.clock.wait(self.condition_left)
                         self.waiting_left -= 1
+                        self.wakeups += 1
+                        woken = True
             else:  # direction == "right"
                 while True:
-                    if (self.current_direction in [None, "right"]) and self.can_enter_right():
-                        self.set_direction_if_none("right")
-                        self.on_bridge += 1
-                        enter_time = time.time()
-                        return enter_time
+                    now = self.clock.time()
+                    if (self.current_direction in [None, "right"]) and self.can_enter_right() and self.admits(now):
+                        enter_time = self.take_place("right", now)  # Момент фактического "въезда"
+                        if woken:
+                            self.track_waiting("right", arrival_real_time, -1)
+                        break
                     else:
+                        if woken:
+                            self.futile_wakeups += 1
+                        else:
+                            self.track_waiting("right", arrival_real_time, 1)
                         self.waiting_right += 1
-                        self.condition.wait()
+                        self.waits += 1
+                        self.clock.wait(self.condition_right)
                         self.waiting_right -= 1
+                        self.wakeups += 1
+                        woken = True
+
+        delay = enter_time - self.clock.time()
+        if delay > 0:
+            self.clock.sleep(delay)
+        return enter_time
 
     def leave(self, enter_time: float):
         """
-        Выезд с моста занимает 1 реальную секунду (time.sleep(1)).
+        Выезд с моста занимает crossing_time (1 секунду) по часам моста.
         После этого освобождаем ресурс. При необходимости переключаем направление.
         """
-        time.sleep(1.0)  # имитация реального проезда
-        leave_time = time.time()
+        self.clock.sleep(self.crossing_time)  # имитация реального проезда
+        leave_time = self.clock.time()
 
         with self.condition:
             self.on_bridge -= 1
-            # Завершаем машину в текущем батче
-            self.cars_in_current_batch += 1
-
-            # Проверка условий переключения направления
-            if self.on_bridge == 0:  # Мост опустел — можно подумать о смене направления
-                if self.current_direction == "left":
-                    if self.cars_in_current_batch >= self.batch_size and self.waiting_right > 0:
-                        self.current_direction = "right"
-                        self.cars_in_current_batch = 0
-                        self.condition.notify_all()
-                    else:
-                        # Если машин нет вообще - обнуляем направление
-                        if self.waiting_left == 0 and self.waiting_right == 0:
-                            self.current_direction = None
-                            self.cars_in_current_batch = 0
-                        else:
-                            if self.waiting_left > 0:
-                                self.condition.notify_all()
-                            elif self.waiting_right > 0:
-                                self.current_direction = "right"
-                                self.cars_in_current_batch = 0
-                                self.condition.notify_all()
-
-                else:  # current_direction == "right"
-                    if self.cars_in_current_batch >= self.batch_size and self.waiting_left > 0:
-                        self.current_direction = "left"
+
+            # Мост опустел — спрашиваем политику, кого пускать дальше
+            if self.on_bridge == 0:
+                now = self.clock.time()
+                direction = self.policy.next_direction(self, now)
+                if self.tracer is not None and direction != self.current_direction:
+                    self.tracer.batch(self.current_direction, self.batch_entered_at, leave_time,
+                                      self.cars_in_current_batch)
+                if direction is None:
+                    # Если машин нет вообще - обнуляем направление
+                    self.current_direction = None
+                    self.cars_in_current_batch = 0
+                else:
+                    if direction != self.current_direction:
+                        self.direction_switches += 1
+                        self.current_direction = direction
                         self.cars_in_current_batch = 0
-                        self.condition.notify_all()
-                    else:
-                        if self.waiting_left == 0 and self.waiting_right == 0:
-                            self.current_direction = None
-                            self.cars_in_current_batch = 0
-                        else:
-                            if self.waiting_right > 0:
-                                self.condition.notify_all()
-                            elif self.waiting_left > 0:
-                                self.current_direction = "left"
-                                self.cars_in_current_batch = 0
-                                self.condition.notify_all()
+                        self.batch_started_at = now
+                    self.wake(direction)
+            elif self.get_waiting(self.current_direction) > 0 and self.admits(self.clock.time()):
+                # Колонна продолжается: в освободившееся место может пристроиться ожидающий
+                self.wake(self.current_direction)
 
         return leave_time
 
-    def set_direction_if_none(self, direction: str):
+    def snapshot(self):
+        """
+        Снимок счётчиков моста: ожидания, пробуждения (в том числе напрасные,
+        после которых машина снова засыпает), смены направления и,
+        если мосту передали metrics, — время захвата и удержания замка.
+        """
+        with self.lock:
+            result = {
+                "waits": self.waits,
+                "wakeups": self.wakeups,
+                "futile_wakeups": self.futile_wakeups,
+                "direction_switches": self.direction_switches,
+            }
+            if self.metrics is not None:
+                result.update(self.metrics.snapshot())
+        return result
+
+    def wake(self, direction: str):
+        """
+        Будит машины, ждущие въезда в направлении direction.
+        В общем режиме будятся все ожидающие, как раньше.
+        """
+        if self.per_direction:
+            # Будим не больше машин, чем свободных мест на мосту
+            free = self.capacity - self.on_bridge
+            if direction == "left":
+                self.clock.notify(self.condition_left, free)
+            else:
+                self.clock.notify(self.condition_right, free)
+        else:
+            self.clock.notify_all(self.condition)
+
+    def take_place(self, direction: str, now: float) -> float:
+        # Вызывается под self.lock; возвращает момент въезда с учётом headway
+        enter_time = now
+        if self.on_bridge > 0:
+            enter_time = max(now, self.next_entry_time)
+        self.set_direction_if_none(direction, enter_time)
+        if self.cars_in_current_batch == 0:
+            self.batch_entered_at = enter_time
+        self.on_bridge += 1
+        self.cars_in_current_batch += 1
+        self.next_entry_time = enter_time + self.headway
+        return enter_time
+
+    def admits(self, now: float) -> bool:
+        """Открыт ли въезд в хвост колонны: на пустой мост решение уже приняла политика."""
+        return self.on_bridge == 0 or self.policy.keep_admitting(self, now)
+
+    def get_waiting(self, direction: str) -> int:
+        return self.waiting_left if direction == "left" else self.waiting_right
+
+    def track_waiting(self, direction: str, arrival_time: float, delta: int):
+        # Учёт времён прибытия ведём, только если он нужен политике
+        if self.waiting_times is not None:
+            if delta > 0:
+                self.waiting_times[direction].add(arrival_time)
+            else:
+                self.waiting_times[direction].remove(arrival_time)
+
+    def oldest_waiting(self, direction: str) -> float:
+        """Время прибытия самой старой ожидающей машины направления (inf, если таких нет)."""
+        return self.waiting_times[direction].oldest()
+
+    def set_direction_if_none(self, direction: str, now: float = 0.0):
         if self.current_direction is None:
             self.current_direction = direction
             self.cars_in_current_batch = 0
+            self.batch_started_at = now
 
     def can_enter_left(self):
         # При желании можно накладывать дополнительные логики
-         return (self.on_bridge < 1 
+         return (self.on_bridge < self.capacity
             and (self.current_direction is None or self.current_direction == "left"))
 
     def can_enter_right(self):
-        return (self.on_bridge < 1 
+        return (self.on_bridge < self.capacity
             and (self.current_direction is None or self.current_direction == "right"))
@@ -0,0 +1,131 @@
+# project/bridge/shared_memory.py
+import multiprocessing
+from multiprocessing import shared_memory
+
+from .multi_threaded import MultiThreadedBridge
+
+# Состояние моста в общей памяти: сначала целые поля, затем вещественные, по 8 байт.
+# Направление хранится кодом: -1 — нет, 0 — left, 1 — right.
+INT_FIELDS = ("direction", "on_bridge", "waiting_left", "waiting_right", "cars_in_current_batch",
+              "wakeups", "futile_wakeups", "waits", "direction_switches", "sleepers")
+FLOAT_FIELDS = ("next_available_time_left", "next_available_time_right", "batch_started_at", "batch_entered_at")
+DIRECTIONS = ("left", "right")
+NO_DIRECTION = -1
+
+
+def shared_int(name: str):
+    index = INT_FIELDS.index(name)
+
+    def get(self):
+        return self.ints[index]
+
+    def set(self, value):
+        self.ints[index] = value
+    return property(get, set)
+
+
+def shared_float(name: str):
+    index = FLOAT_FIELDS.index(name)
+
+    def get(self):
+        return self.floats[index]
+
+    def set(self, value):
+        self.floats[index] = value
+    return property(get, set)
+
+
+class SharedMemoryBridge(MultiThreadedBridge):
+    """
+    Логический мост MultiThreadedBridge для машин-процессов.
+    Логика въезда и выезда та же, но состояние (направление, машины на мосту,
+    ожидающие, счётчик партии, счётчики пробуждений) лежит в multiprocessing.shared_memory,
+    а замок и условные переменные — межпроцессные, на семафорах ОС.
+    Без GIL замеры конкуренции показывают цену настоящей параллельной синхронизации.
+
+    Мост передаётся процессам-машинам при их создании (см. simulation.process_simulator).
+    Процесс-машина по окончании отключается через detach(), создатель моста
+    освобождает общую память через close() или with;
+    после close() итоговое состояние и счётчики остаются доступны для чтения.
+    Политики, которым нужно время прибытия самой старой машины, не поддерживаются.
+    """
+
+    direction = shared_int("direction")
+    on_bridge = shared_int("on_bridge")
+    waiting_left = shared_int("waiting_left")
+    waiting_right = shared_int("waiting_right")
+    cars_in_current_batch = shared_int("cars_in_current_batch")
+    wakeups = shared_int("wakeups")
+    futile_wakeups = shared_int("futile_wakeups")
+    waits = shared_int("waits")
+    direction_switches = shared_int("direction_switches")
+    sleepers = shared_int("sleepers")
+    next_available_time_left = shared_float("next_available_time_left")
+    next_available_time_right = shared_float("next_available_time_right")
+    batch_started_at = shared_float("batch_started_at")
+    batch_entered_at = shared_float("batch_entered_at")
+
+    def __init__(self, batch_size=5, per_direction=False, policy=None,
+                 capacity=1, headway=None, crossing_time=1.0, context=None):
+        if policy is not None and policy.needs_oldest:
+            raise ValueError(f"{policy!r} is not supported by SharedMemoryBridge")
+        self.shm = shared_memory.SharedMemory(create=True, size=8 * (len(INT_FIELDS) + len(FLOAT_FIELDS)))
+        self.owner = True
+        self.attach()
+        super().__init__(batch_size=batch_size, per_direction=per_direction, policy=policy,
+                         capacity=capacity, headway=headway, crossing_time=crossing_time)
+
+        # Процессы и очереди прогона создаются в том же контексте, что и замки моста
+        self.context = context = context or multiprocessing.get_context()
+        self.lock = context.Lock()
+        self.condition = context.Condition(self.lock)
+        if per_direction:
+            self.condition_left = context.Condition(self.lock)
+            self.condition_right = context.Condition(self.lock)
+        else:
+            self.condition_left = self.condition_right = self.condition
+
+    def attach(self):
+        split = 8 * len(INT_FIELDS)
+        self.ints = self.shm.buf[:split].cast("q")
+        self.floats = self.shm.buf[split:].cast("d")
+
+    def __getstate__(self):
+        # Представления памяти не передаются между процессами; SharedMemory передаётся по имени
+        state = self.__dict__.copy()
+        del state["ints"], state["floats"], state["context"]
+        state["owner"] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.attach()
+
+    @property
+    def current_direction(self):
+        code = self.direction
+        return None if code == NO_DIRECTION else DIRECTIONS[code]
+
+    @current_direction.setter
+    def current_direction(self, value):
+        self.direction = NO_DIRECTION if value is None else DIRECTIONS.index(value)
+
+    def detach(self):
+        """Отключает процесс от общей памяти; итоговое состояние копируется в обычные списки и остаётся читаемым."""
+        ints, floats = self.ints, self.floats
+        self.ints, self.floats = ints.tolist(), floats.tolist()
+        ints.release()
+        floats.release()
+        self.shm.close()
+
+    def close(self):
+        self.detach()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
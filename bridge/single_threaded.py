@@ -1,15 +1,78 @@
 #project/bridge/single_threaded.py
+from collections import deque
 from .base import BaseBridge
 
 class SingleThreadedBridge(BaseBridge):
-    def __init__(self):
+    def __init__(self, capacity=1, headway=None, crossing_time=1.0):
         self.next_available_time = 0.0 
+
+        # Колонна: машины того же направления, что и предыдущая, въезжают
+        # через headway после неё, пока на мосту не больше capacity машин.
+        # Машина встречного направления ждёт, пока мост не опустеет.
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.crossing_time = crossing_time
+        self.headway = crossing_time if headway is None else headway
+        self.current_direction = None
+        self.last_enter_time = 0.0
+        self.leave_times = deque(maxlen=capacity)  # выезды последних capacity машин колонны
     
     def enter(self, direction: str, arrival_time: float):
-        enter_time = max(arrival_time, self.next_available_time)
+        if self.capacity == 1 or direction != self.current_direction:
+            enter_time = max(arrival_time, self.next_available_time)
+        else:
+            enter_time = max(arrival_time, self.last_enter_time + self.headway)
+            if len(self.leave_times) == self.capacity:
+                # Мост полон: ждём, пока съедет машина, въехавшая capacity машин назад
+                enter_time = max(enter_time, self.leave_times[0])
+        self.current_direction = direction
+        self.last_enter_time = enter_time
         return enter_time
 
     def leave(self, enter_time: float):
-        leave_time = enter_time + 1.0
+        leave_time = enter_time + self.crossing_time
+        # Машины колонны выезжают в порядке въезда, поэтому это момент, когда мост пуст
         self.next_available_time = leave_time
+        self.leave_times.append(leave_time)
         return leave_time
+
+    def cross_batch(self, arrival_times, directions=None):
+        """
+        Векторизованный вариант enter/leave для массива прибытий,
+        отсортированного по возрастанию. Рекуррентность
+            enter_i = max(arrival_i, enter_{i-1} + c),  c = crossing_time
+        раскрывается в кумулятивный максимум:
+            enter_i = i*c + max(next_available_time, max_{j<=i}(arrival_j - j*c)).
+        Возвращает массивы NumPy (enter, wait, leave) и сдвигает next_available_time,
+        как если бы машины прошли через enter/leave по одной.
+        Для колонны (capacity > 1) въезд зависит от направлений (directions),
+        и рекуррентность не сводится к cummax — тогда машины идут через enter/leave по одной.
+        """
+        import numpy as np
+
+        arrivals = np.asarray(arrival_times, dtype=np.float64)
+        if arrivals.size == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty.copy(), empty.copy()
+
+        if self.capacity > 1:
+            if directions is None:
+                raise ValueError("directions are required when capacity > 1")
+            enter = np.empty_like(arrivals)
+            for i, (direction, arrival_time) in enumerate(zip(directions, arrivals.tolist())):
+                enter[i] = self.enter(direction, arrival_time)
+                self.leave(enter[i])
+            return enter, enter - arrivals, enter + self.crossing_time
+
+        idx = np.arange(arrivals.size, dtype=np.float64) * self.crossing_time
+        enter = np.maximum.accumulate(arrivals - idx)
+        np.maximum(enter, self.next_available_time, out=enter)
+        enter += idx
+        # (arrival - i) + i может уйти на один ulp ниже arrival
+        np.maximum(enter, arrivals, out=enter)
+
+        wait = enter - arrivals
+        leave = enter + self.crossing_time
+        self.next_available_time = float(leave[-1])
+        return enter, wait, leave
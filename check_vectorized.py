@@ -0,0 +1,40 @@
+# check_vectorized.py
+# Сверка векторизованного SingleThreadedBridge.cross_batch с поштучным enter/leave
+import time
+
+import numpy as np
+
+from bridge.single_threaded import SingleThreadedBridge
+
+TOLERANCE = 1e-6
+
+
+def reference(arrivals):
+    bridge = SingleThreadedBridge()
+    enter, wait, leave = [], [], []
+    for a_time in arrivals:
+        enter_time = bridge.enter("left", a_time)
+        leave_time = bridge.leave(enter_time)
+        enter.append(enter_time)
+        wait.append(enter_time - a_time)
+        leave.append(leave_time)
+    return enter, wait, leave
+
+
+if __name__ == "__main__":
+    for n, arrival_span in [(10, 10.0), (10000, 10.0), (10000, 100000.0), (1000000, 10.0), (1000000, 2000000.0)]:
+        # Тот же генератор, что у run_vectorized_simulation: одним вызовом NumPy
+        arrivals = np.sort(np.random.default_rng(n).uniform(0, arrival_span, n))
+
+        start = time.time()
+        ref = reference(arrivals.tolist())
+        ref_time = time.time() - start
+
+        start = time.time()
+        vec = SingleThreadedBridge().cross_batch(arrivals)
+        vec_time = time.time() - start
+
+        max_diff = max(max(abs(x - y) for x, y in zip(r, v.tolist())) for r, v in zip(ref, vec))
+        print(f"{n} cars, span {arrival_span}: per-car {ref_time:.3f} s, vectorized {vec_time:.3f} s, "
+              f"max diff {max_diff:.2e}")
+        assert max_diff <= TOLERANCE, f"cross_batch расходится с enter/leave: {max_diff}"
@@ -1,52 +1,39 @@
-import csv
-import matplotlib.pyplot as plt
-
-def load_results(filename):
-    cars = []
-    with open(filename, "r", newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            car_id = int(row["CarID"])
-            direction = row["Direction"]
-            wait = float(row["WaitingTime"])
-            cross = float(row["CrossingTime"])
-            cars.append((car_id, direction, wait, cross))
-    return cars
+import sys
+
+from compare.report import render_report, summarize_files, summarize_rows
+# load_results остаётся доступным отсюда, как раньше
+from simulation.sinks import load_results
+
 
 def compute_stats(cars):
-    waits = [c[2] for c in cars]
-    avg_wait = sum(waits)/len(waits) if waits else 0
-    max_wait = max(waits) if waits else 0
-    crosses = [c[3] for c in cars]
-    avg_cross = sum(crosses)/len(crosses) if crosses else 0
-    return avg_wait, max_wait, avg_cross
-
-def compare_results(single_file="single_threaded_results.csv", multi_file="multi_threaded_results.csv"):
-    single_cars = load_results(single_file)
-    multi_cars = load_results(multi_file)
-
-    s_avg_wait, s_max_wait, s_avg_cross = compute_stats(single_cars)
-    m_avg_wait, m_max_wait, m_avg_cross = compute_stats(multi_cars)
-
-    print("Single-threaded:")
-    print(f"  Avg wait: {s_avg_wait:.4f} s, Max wait: {s_max_wait:.4f} s, Avg cross: {s_avg_cross:.4f} s")
-    print("Multi-threaded:")
-    print(f"  Avg wait: {m_avg_wait:.4f} s, Max wait: {m_max_wait:.4f} s, Avg cross: {m_avg_cross:.4f} s")
-
-    labels = ['Avg Waiting', 'Max Waiting', 'Avg Crossing']
-    single_vals = [s_avg_wait, s_max_wait, s_avg_cross]
-    multi_vals = [m_avg_wait, m_max_wait, m_avg_cross]
-
-    x = range(len(labels))
-    plt.figure(figsize=(10, 6))
-    plt.bar([i - 0.2 for i in x], single_vals, width=0.4, label="Single-threaded")
-    plt.bar([i + 0.2 for i in x], multi_vals, width=0.4, label="Multi-threaded")
-    plt.xticks(range(len(labels)), labels)
-    plt.ylabel("Time (s)")
-    plt.title("Comparison of Single-threaded vs Multi-threaded Simulation")
-    plt.legend()
-    plt.savefig("comparison_chart.png")
-    plt.show()
+    """
+    Среднее ожидание, максимальное ожидание и средний проезд по результатам load_results().
+    Прежний интерфейс; считает compare.report.summarize_rows.
+    """
+    summary = summarize_rows(cars, binary=hasattr(cars, "dtype"))
+    return summary["avg_wait"], summary["max_wait"], summary["avg_cross"]
+
+
+def compare_results(*files, output_dir=".", prefix="comparison"):
+    """
+    Сравнивает файлы результатов (CSV или бинарные) и сохраняет графики в output_dir.
+    По умолчанию — однопоточный и многопоточный прогоны.
+    Графики — {prefix}_wait.png, {prefix}_total_time.png, {prefix}_directions.png
+    и {prefix}_quantiles.png (см. compare.report.render_report) вместо прежнего comparison_chart.png.
+    """
+    files = files or ("single_threaded_results.csv", "multi_threaded_results.csv")
+    summaries = summarize_files(files)
+
+    for label, summary in summaries.items():
+        print(f"{label}:")
+        print(f"  Avg wait: {summary['avg_wait']:.4f} s, Max wait: {summary['max_wait']:.4f} s, "
+              f"Avg cross: {summary['avg_cross']:.4f} s")
+
+    for path in render_report(summaries, output_dir=output_dir, prefix=prefix):
+        print(f"График сохранён в {path}")
+    return summaries
+
 
 if __name__ == "__main__":
-    compare_results()
+    # python -m compare.compare [файл ...]
+    compare_results(*sys.argv[1:])
@@ -0,0 +1,126 @@
+# project/compare/report.py
+import os
+
+from simulation.sinks import is_binary_file, load_results
+from simulation.stats import OnlineStats
+
+# Направление в бинарных файлах результатов закодировано числом
+BINARY_DIRECTIONS = ("left", "right")
+
+
+def pyplot():
+    """
+    matplotlib.pyplot с неинтерактивным бэкендом Agg.
+    Импортируется только здесь, при рисовании: скрипты, которым графики не нужны,
+    не платят за импорт, а на машинах без дисплея ничего не ждёт окна.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def summarize_file(path: str):
+    """Сводка OnlineStats по файлу результатов (CSV или бинарному) за один проход."""
+    return summarize_rows(load_results(path), binary=is_binary_file(path))
+
+
+def summarize_rows(cars, binary: bool = False):
+    """
+    Сводка OnlineStats по уже загруженным результатам: строкам (car_id, direction, wait, cross, arrival)
+    или, при binary, структурированному массиву из бинарного файла.
+    """
+    stats = OnlineStats()
+    if binary:
+        for car in cars:
+            stats.write(int(car[0]), BINARY_DIRECTIONS[car[1]], float(car[2]), float(car[3]), float(car[4]))
+    else:
+        stats.write_many(cars)
+    return stats.summary()
+
+
+def summarize_files(paths):
+    """
+    Сводки по многим файлам: {метка: summary}.
+    paths — список путей (метка — имя файла без расширения) или словарь {метка: путь}.
+    """
+    if not isinstance(paths, dict):
+        paths = {os.path.splitext(os.path.basename(path))[0]: path for path in paths}
+    return {label: summarize_file(path) for label, path in paths.items()}
+
+
+def save_bar_chart(path: str, labels, series, ylabel: str, title: str):
+    """
+    Сгруппированные столбцы: по группе на метку, по столбцу на серию.
+    series — {имя серии: значения по меткам}.
+    """
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    width = 0.8 / max(len(series), 1)
+    for k, (name, values) in enumerate(series.items()):
+        offset = (k - (len(series) - 1) / 2) * width
+        ax.bar([i + offset for i in range(len(labels))], values, width=width, label=name)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels, rotation=30 if len(labels) > 4 else 0, ha="right" if len(labels) > 4 else "center")
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def save_line_chart(path: str, x, series, xlabel: str, ylabel: str, title: str):
+    """Линии по точкам x; series — {подпись линии: значения}."""
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for name, values in series.items():
+        ax.plot(x, values, marker="o", label=name)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def render_report(summaries, output_dir: str = ".", prefix: str = "report"):
+    """
+    Рисует все графики сравнения прогонов и возвращает список сохранённых PNG.
+    summaries — {метка: summary()} из summarize_files() или OnlineStats;
+    метками могут быть движки, политики, параметры — графики одни и те же:
+    - {prefix}_wait.png: среднее и максимальное ожидание
+    - {prefix}_total_time.png: общее время прогона
+    - {prefix}_directions.png: среднее ожидание по направлениям
+    - {prefix}_quantiles.png: квантили ожидания, если они есть в сводках
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    labels = list(summaries)
+    rows = [summaries[label] for label in labels]
+
+    def target(name):
+        return os.path.join(output_dir, f"{prefix}_{name}.png")
+
+    paths = [
+        save_bar_chart(target("wait"), labels,
+                       {"Avg wait": [row["avg_wait"] for row in rows],
+                        "Max wait": [row["max_wait"] for row in rows]},
+                       "Time (s)", "Waiting time"),
+        save_bar_chart(target("total_time"), labels,
+                       {"Total time": [row["total_time"] for row in rows]},
+                       "Time (s)", "Total simulated time"),
+        save_bar_chart(target("directions"), labels,
+                       {f"{direction} avg wait": [row.get(f"{direction}_avg_wait", 0.0) for row in rows]
+                        for direction in ("left", "right")},
+                       "Time (s)", "Average waiting time by direction"),
+    ]
+    quantiles = [key for key in rows[0] if key.startswith("p") and key.endswith("_wait")] if rows else []
+    if quantiles:
+        paths.append(save_bar_chart(target("quantiles"), labels,
+                                    {key[:-len("_wait")]: [row[key] for row in rows] for key in quantiles},
+                                    "Time (s)", "Waiting time quantiles"))
+    return paths
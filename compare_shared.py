@@ -0,0 +1,45 @@
+# compare_shared.py
+# Цена синхронизации под настоящей конкуренцией: пул потоков на MultiThreadedBridge
+# (замок и GIL одного процесса) против пула процессов на SharedMemoryBridge
+# (общая память и межпроцессные семафоры). Все машины приезжают почти разом.
+import os
+import random
+import time
+
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.shared_memory import SharedMemoryBridge
+from simulation.process_simulator import run_process_simulation
+from simulation.simulator import run_simulation
+from simulation.stats import OnlineStats
+
+
+def report(name, elapsed, bridge, stats):
+    metrics = bridge.snapshot()
+    print(f"{name:28} {elapsed:7.2f} s, {stats.summary()['count'] / elapsed:9.0f} cars/s, "
+          f"wakeups {metrics['wakeups']} ({metrics['futile_wakeups']} futile), "
+          f"switches {metrics['direction_switches']}")
+
+
+if __name__ == "__main__":
+    num_cars = 20000
+    arrival_span = 100.0  # перегрузка: очереди с обеих сторон всё время
+    seed = 42
+    rng = random.Random(f"directions-{seed}")
+    directions = [rng.choice(["left", "right"]) for _ in range(num_cars)]
+
+    for workers in sorted({2, max(2, os.cpu_count() or 1), 8}):
+        for per_direction in (False, True):
+            label = "per-direction" if per_direction else "shared cond"
+
+            bridge = MultiThreadedBridge(per_direction=per_direction)
+            stats = OnlineStats()
+            start = time.time()
+            run_simulation(bridge, directions, True, None, arrival_span, workers=workers, stats=stats, seed=seed)
+            report(f"{workers} threads, {label}", time.time() - start, bridge, stats)
+
+            with SharedMemoryBridge(per_direction=per_direction) as bridge:
+                stats = OnlineStats()
+                start = time.time()
+                run_process_simulation(bridge, directions, None, arrival_span, processes=workers, stats=stats, seed=seed)
+                elapsed = time.time() - start
+            report(f"{workers} processes, {label}", elapsed, bridge, stats)
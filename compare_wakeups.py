@@ -0,0 +1,51 @@
+# compare_wakeups.py
+# Сравнение числа пробуждений: общая условная переменная vs отдельная на направление.
+# Чтобы все машины действительно ждали, мост сначала занимает машина-блокировщик,
+# затем стартуют потоки всех машин, и только после этого блокировщик уезжает.
+import threading
+import time
+
+from bridge.metrics import BridgeMetrics
+from bridge.multi_threaded import MultiThreadedBridge
+
+
+def run_contended(bridge, directions):
+    def car_thread(direction: str, arrival_time: float):
+        enter_time = bridge.enter(direction, arrival_time)
+        bridge.leave(enter_time)
+
+    blocker_enter = bridge.enter("left", 0.0)
+
+    threads = [threading.Thread(target=car_thread, args=(d, 0.0)) for d in directions]
+    for t in threads:
+        t.start()
+    while True:
+        with bridge.condition:
+            if bridge.waiting_left + bridge.waiting_right == len(directions):
+                break
+        time.sleep(0.01)
+
+    start_time = time.time()
+    bridge.leave(blocker_enter)
+    for t in threads:
+        t.join()
+    return time.time() - start_time
+
+
+if __name__ == "__main__":
+    num_cars_list = [100, 1000, 5000, 10000]
+
+    for n in num_cars_list:
+        directions = ["left", "right"] * (n // 2)
+        print(f"\n=== For {n} waiting cars ===")
+        for per_direction in (False, True):
+            bridge = MultiThreadedBridge(per_direction=per_direction, metrics=BridgeMetrics())
+            elapsed = run_contended(bridge, directions)
+            metrics = bridge.snapshot()
+            mode = "per-direction" if per_direction else "shared       "
+            print(f"  {mode}: wakeups = {metrics['wakeups']}, futile = {metrics['futile_wakeups']}, "
+                  f"drain time = {elapsed:.2f} s")
+            print(f"                 lock acquisitions = {metrics['lock_acquisitions']}, "
+                  f"acquire wait = {metrics['lock_acquire_wait_total']:.3f} s "
+                  f"(max {metrics['lock_acquire_wait_max'] * 1000:.2f} ms), "
+                  f"hold = {metrics['lock_hold_total']:.3f} s")
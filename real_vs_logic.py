@@ -1,9 +1,5 @@
 # project/real_vs_logic.py
-import os
-import csv
-import matplotlib.pyplot as plt
 import random
-import time
 
 # Логические классы мостов
 from bridge.single_threaded import SingleThreadedBridge
@@ -12,53 +8,27 @@ from bridge.multi_threaded import MultiThreadedBridge
 # Реальные классы мостов
 from bridge.real_single_threaded import RealSingleThreadedBridge
 from bridge.real_multi_threaded import RealMultiThreadedBridge
+from bridge.clock import ScaledClock
+
+# Графики: matplotlib импортируется только при рисовании, без окон
+from compare.report import save_line_chart
 
 # Функции симуляции
 from simulation.simulator import run_simulation           # логическая симуляция
 from simulation.real_simulator import run_real_simulation # реальная симуляция
-
-def load_results(filename):
-    cars = []
-    with open(filename, "r", newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            car_id = int(row["CarID"])
-            direction = row["Direction"]
-            wait = float(row["WaitingTime"])
-            cross = float(row["CrossingTime"])
-            arrival_time = float(row["ArrivalTime"])
-            cars.append((car_id, direction, wait, cross, arrival_time))
-    return cars
-
-def compute_wait_stats(cars):
-    """
-    Среднее и максимальное время ожидания.
-    """
-    waits = [c[2] for c in cars]  # c[2] = wait_time
-    avg_wait = sum(waits)/len(waits) if waits else 0
-    max_wait = max(waits) if waits else 0
-    return avg_wait, max_wait
-
-def compute_logic_total_time(cars):
-    """
-    'Логическое' общее время = (finish_time последней машины) - (минимальное arrival_time).
-    finish_time = arrival_time + waiting_time + crossing_time.
-    """
-    if not cars:
-        return 0
-    min_arrival = min(c[4] for c in cars)  # c[4] = arrival_time
-    finish_times = [c[4] + c[2] + c[3] for c in cars]  # arrival_time + wait_time + crossing_time
-    max_finish = max(finish_times)
-    total_time = max_finish - min_arrival
-    return total_time
+from simulation.stats import OnlineStats  # статистика на лету, без временных CSV
 
 if __name__ == "__main__":
     # Кол-ва машин для тестов
     num_cars_list = [5, 10, 50, 100]
     arrival_span = 2.0  # Для real-модели, чтобы не слишком затягивать
+    # Real-модели идут по ускоренным часам: секунда моста = 1/time_scale реальной секунды.
+    # Блокировки при этом настоящие; time_scale = 1.0 вернёт честное реальное время.
+    time_scale = 100.0
 
     # Вероятность направления - 50/50
     p_left = 0.5
+    seed = 42
 
     # Храним результаты по следующим метрикам:
     #   logic_single_time, logic_multi_time : "логическое" общее время
@@ -75,88 +45,89 @@ if __name__ == "__main__":
     real_multi_avg_wait   = []
 
     for n in num_cars_list:
-        directions = [("left" if random.random() < p_left else "right") for _ in range(n)]
+        # Зерно на каждое n: прогоны воспроизводимы от запуска к запуску
+        rng = random.Random(f"{seed}-{n}")
+        directions = [("left" if rng.random() < p_left else "right") for _ in range(n)]
         
         ### ЛОГИЧЕСКАЯ ОДНОПОТОЧНАЯ ###
-        single_file = "logic_single_temp.csv"
+        single_stats = OnlineStats()
         bridge_single = SingleThreadedBridge()
         run_simulation(
             bridge_instance=bridge_single,
             direction_list=directions,
             threaded=False,
-            output_file=single_file,
-            arrival_span=10.0  # "логическое" arrival_span
+            output_file=None,
+            arrival_span=10.0,  # "логическое" arrival_span
+            seed=seed + n,
+            stats=single_stats
         )
-        single_cars = load_results(single_file)
-        os.remove(single_file)
 
-        logic_single_tt = compute_logic_total_time(single_cars)  # логическое общее время
+        # 'Логическое' общее время = (finish_time последней машины) - (минимальное arrival_time)
+        logic_single_tt = single_stats.total_time
         logic_single_time.append(logic_single_tt)
 
-        s_avg, _ = compute_wait_stats(single_cars)
+        s_avg = single_stats.wait.mean
         logic_single_avg_wait.append(s_avg)
 
         ### ЛОГИЧЕСКАЯ МНОГОПОТОЧНАЯ ###
-        multi_file = "logic_multi_temp.csv"
+        multi_stats = OnlineStats()
         bridge_multi = MultiThreadedBridge()
         run_simulation(
             bridge_instance=bridge_multi,
             direction_list=directions,
             threaded=True,
-            output_file=multi_file,
-            arrival_span=10.0
+            output_file=None,
+            arrival_span=10.0,
+            seed=seed + n,
+            stats=multi_stats
         )
-        multi_cars = load_results(multi_file)
-        os.remove(multi_file)
 
-        logic_multi_tt = compute_logic_total_time(multi_cars)
+        logic_multi_tt = multi_stats.total_time
         logic_multi_time.append(logic_multi_tt)
 
-        m_avg, _ = compute_wait_stats(multi_cars)
+        m_avg = multi_stats.wait.mean
         logic_multi_avg_wait.append(m_avg)
 
         ### РЕАЛЬНАЯ ОДНОПОТОЧНАЯ ###
-        real_single_file = "real_single_temp.csv"
-        real_single_bridge = RealSingleThreadedBridge()
-        start_time = time.time()
+        real_single_stats = OnlineStats()
+        real_single_bridge = RealSingleThreadedBridge(clock=ScaledClock(time_scale))
+        start_time = real_single_bridge.clock.time()
         # Здесь threaded=False, чтобы САМА симуляция шла в одном потоке
         run_real_simulation(
             bridge_instance=real_single_bridge,
             direction_list=directions,
             threaded=False,
-            output_file=real_single_file,
-            arrival_span=arrival_span
+            output_file=None,
+            arrival_span=arrival_span,
+            seed=seed + n,
+            stats=real_single_stats
         )
-        end_time = time.time()
+        end_time = real_single_bridge.clock.time()
         real_single_total = end_time - start_time  # реальное время выполнения всей симуляции
         real_single_time.append(real_single_total)
 
-        real_single_cars = load_results(real_single_file)
-        os.remove(real_single_file)
-
-        rs_avg, _ = compute_wait_stats(real_single_cars)
+        rs_avg = real_single_stats.wait.mean
         real_single_avg_wait.append(rs_avg)
 
         ### РЕАЛЬНАЯ МНОГОПОТОЧНАЯ ###
-        real_multi_file = "real_multi_temp.csv"
-        real_multi_bridge = RealMultiThreadedBridge()
-        start_time = time.time()
+        real_multi_stats = OnlineStats()
+        real_multi_bridge = RealMultiThreadedBridge(clock=ScaledClock(time_scale))
+        start_time = real_multi_bridge.clock.time()
         # threaded=True, чтобы многопоточность реально включалась
         run_real_simulation(
             bridge_instance=real_multi_bridge,
             direction_list=directions,
             threaded=True,
-            output_file=real_multi_file,
-            arrival_span=arrival_span
+            output_file=None,
+            arrival_span=arrival_span,
+            seed=seed + n,
+            stats=real_multi_stats
         )
-        end_time = time.time()
+        end_time = real_multi_bridge.clock.time()
         real_multi_total = end_time - start_time
         real_multi_time.append(real_multi_total)
 
-        real_multi_cars = load_results(real_multi_file)
-        os.remove(real_multi_file)
-
-        rm_avg, _ = compute_wait_stats(real_multi_cars)
+        rm_avg = real_multi_stats.wait.mean
         real_multi_avg_wait.append(rm_avg)
 
         print(f"\n=== For {n} cars ===")
@@ -168,51 +139,31 @@ if __name__ == "__main__":
     ########## ПОСТРОИМ ГРАФИКИ ##########
 
     # 1) Сравнение "логическое время симуляции" vs "реальное общее время" – Single
-    plt.figure(figsize=(10,6))
-    plt.plot(num_cars_list, logic_single_time, marker='o', label="Logic Single (Total Logic Time)")
-    plt.plot(num_cars_list, real_single_time, marker='o', label="Real Single (Total Real Time)")
-    plt.xlabel("Number of cars")
-    plt.ylabel("Simulation total time (seconds)")
-    plt.title("Single-threaded: Logic vs Real (trend comparison)")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("compare_single_total_time.png")
-    plt.show()
+    save_line_chart("compare_single_total_time.png", num_cars_list,
+                    {"Logic Single (Total Logic Time)": logic_single_time,
+                     "Real Single (Total Real Time)": real_single_time},
+                    "Number of cars", "Simulation total time (seconds)",
+                    "Single-threaded: Logic vs Real (trend comparison)")
 
     # 2) Сравнение "логическое время" vs "реальное время" – Multi
-    plt.figure(figsize=(10,6))
-    plt.plot(num_cars_list, logic_multi_time, marker='o', label="Logic Multi (Total Logic Time)")
-    plt.plot(num_cars_list, real_multi_time, marker='o', label="Real Multi (Total Real Time)")
-    plt.xlabel("Number of cars")
-    plt.ylabel("Simulation total time (seconds)")
-    plt.title("Multi-threaded: Logic vs Real (trend comparison)")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("compare_multi_total_time.png")
-    plt.show()
+    save_line_chart("compare_multi_total_time.png", num_cars_list,
+                    {"Logic Multi (Total Logic Time)": logic_multi_time,
+                     "Real Multi (Total Real Time)": real_multi_time},
+                    "Number of cars", "Simulation total time (seconds)",
+                    "Multi-threaded: Logic vs Real (trend comparison)")
 
     # 3) Сравнение real_single vs real_multi (общее реальное время)
-    plt.figure(figsize=(10,6))
-    plt.plot(num_cars_list, real_single_time, marker='o', label="Real Single (Total Execution Time)")
-    plt.plot(num_cars_list, real_multi_time, marker='o', label="Real Multi (Total Execution Time)")
-    plt.xlabel("Number of cars")
-    plt.ylabel("Total real execution time (seconds)")
-    plt.title("Real Single vs Real Multi: total execution time")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("real_single_vs_multi.png")
-    plt.show()
+    save_line_chart("real_single_vs_multi.png", num_cars_list,
+                    {"Real Single (Total Execution Time)": real_single_time,
+                     "Real Multi (Total Execution Time)": real_multi_time},
+                    "Number of cars", "Total real execution time (seconds)",
+                    "Real Single vs Real Multi: total execution time")
 
     # 4) (Опционально) Сравнение тенденций среднего ожидания (Logic vs Real).
-    plt.figure(figsize=(10,6))
-    plt.plot(num_cars_list, logic_single_avg_wait, marker='o', label="Logic Single AvgWait")
-    plt.plot(num_cars_list, logic_multi_avg_wait, marker='o', label="Logic Multi AvgWait")
-    plt.plot(num_cars_list, real_single_avg_wait, marker='o', label="Real Single AvgWait")
-    plt.plot(num_cars_list, real_multi_avg_wait, marker='o', label="Real Multi AvgWait")
-    plt.xlabel("Number of cars")
-    plt.ylabel("Average waiting time (s)")
-    plt.title("Avg waiting time comparison (Logic vs Real)")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("avg_wait_comparison.png")
-    plt.show()
+    save_line_chart("avg_wait_comparison.png", num_cars_list,
+                    {"Logic Single AvgWait": logic_single_avg_wait,
+                     "Logic Multi AvgWait": logic_multi_avg_wait,
+                     "Real Single AvgWait": real_single_avg_wait,
+                     "Real Multi AvgWait": real_multi_avg_wait},
+                    "Number of cars", "Average waiting time (s)",
+                    "Avg waiting time comparison (Logic vs Real)")
@@ -0,0 +1,31 @@
+# replay_trace.py
+# Проигрывание большого журнала прибытий при постоянной памяти
+import os
+import sys
+
+from bridge.multi_threaded import MultiThreadedBridge
+from simulation.arrivals import mmpp_arrivals, replay_arrivals, write_arrival_log
+from simulation.event_simulator import run_event_simulation
+from simulation.resources import peak_rss_mb
+from simulation.stats import OnlineStats
+
+if __name__ == "__main__":
+    # Путь к журналу можно передать аргументом; если файла нет, пишем синтетический
+    trace_file = sys.argv[1] if len(sys.argv) > 1 else "arrival_trace.bin"
+    if not os.path.exists(trace_file):
+        count = write_arrival_log(trace_file, mmpp_arrivals(rates=(0.3, 0.95), mean_durations=(600.0, 120.0),
+                                                            num_cars=10_000_000, seed=42))
+        print(f"Записан журнал {trace_file}: {count} машин")
+
+    stats = OnlineStats()
+    run_event_simulation(bridge_instance=MultiThreadedBridge(),
+                         direction_list=None,
+                         output_file=None,
+                         arrival_span=None,
+                         stats=stats,
+                         arrivals=replay_arrivals(trace_file))
+
+    summary = stats.summary()
+    print(f"Машин: {summary['count']}, пропускная способность: {summary['throughput']:.3f} машин/с")
+    print(f"Среднее ожидание: {summary['avg_wait']:.2f}, p99: {summary['p99_wait']:.2f}, макс: {summary['max_wait']:.2f}")
+    print(f"Пиковый RSS: {peak_rss_mb():.1f} MB")
@@ -0,0 +1,66 @@
+# run_benchmarks.py
+# Бенчмарки мостов и симуляторов и поиск регрессий относительно сохранённой базы
+#
+#   python run_benchmarks.py run --output bench.json
+#   python run_benchmarks.py run --quick --cases multi/event single/
+#   python run_benchmarks.py compare baseline.json bench.json --threshold 0.1
+import argparse
+import sys
+
+from simulation.benchmark import CASES, SCALES, compare_reports, load_report, run_benchmarks, select_cases
+
+
+def run_command(args):
+    cases = select_cases(args.cases)
+    if not cases:
+        print(f"No benchmark cases match {args.cases}; available: {', '.join(CASES)}")
+        return 2
+    scales = SCALES[:2] if args.quick else tuple(args.scales or SCALES)
+    run_benchmarks(cases=cases, scales=scales, repeats=args.repeats, seed=args.seed, output_file=args.output)
+    return 0
+
+
+def compare_command(args):
+    baseline = load_report(args.baseline)
+    current = load_report(args.current)
+    if baseline["meta"].get("platform") != current["meta"].get("platform"):
+        print("Warning: reports come from different platforms, timings are not directly comparable")
+
+    rows, regressions = compare_reports(baseline, current, threshold=args.threshold, rss_threshold=args.rss_threshold)
+    for row in rows:
+        changes = ", ".join(f"{metric} {row[metric]:+.1%}" for metric in ("cars_per_sec", "peak_rss_mb", "wakeups")
+                            if metric in row)
+        print(f"{row['case']:28} {row['cars']:>8}: {changes}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for case, cars, metric, old, new, change in regressions:
+            print(f"  {case} @ {cars}: {metric} {old:.6g} -> {new:.6g} ({change:+.1%})")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bridge simulation benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark suite")
+    run_parser.add_argument("--output", default="bench.json", help="JSON file for the results")
+    run_parser.add_argument("--cases", nargs="*", help="substrings of case names to run (default: all)")
+    run_parser.add_argument("--scales", nargs="*", type=int, help=f"numbers of cars (default: {SCALES})")
+    run_parser.add_argument("--quick", action="store_true", help="only the two smallest scales")
+    run_parser.add_argument("--repeats", type=int, default=3, help="runs per case; the median wall time is kept")
+    run_parser.add_argument("--seed", type=int, default=0)
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed relative drop in cars/s and growth in wakeups")
+    compare_parser.add_argument("--rss-threshold", type=float, default=0.25,
+                                help="allowed relative growth in peak RSS")
+
+    args = parser.parse_args()
+    command = run_command if args.command == "run" else compare_command
+    sys.exit(command(args))
@@ -0,0 +1,40 @@
+# run_convoy.py
+# Пропускная способность моста в зависимости от вместимости колонны
+import random
+
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.single_threaded import SingleThreadedBridge
+from simulation.event_simulator import run_event_simulation
+from simulation.simulator import run_simulation
+from simulation.stats import OnlineStats
+
+if __name__ == "__main__":
+    num_cars = 50000
+    arrival_span = 12500.0  # 4 машины в секунду: одиночными машинами мост не справится
+    headway = 0.25
+    seed = 42
+
+    rng = random.Random(f"directions-{seed}")
+    directions = [rng.choice(["left", "right"]) for _ in range(num_cars)]
+
+    for capacity in [1, 2, 4, 8]:
+        single_stats = OnlineStats()
+        run_simulation(bridge_instance=SingleThreadedBridge(capacity=capacity, headway=headway),
+                       direction_list=directions,
+                       threaded=False,
+                       output_file=None,
+                       arrival_span=arrival_span,
+                       stats=single_stats,
+                       seed=seed)
+
+        multi_stats = OnlineStats()
+        run_event_simulation(bridge_instance=MultiThreadedBridge(capacity=capacity, headway=headway),
+                             direction_list=directions,
+                             output_file=None,
+                             arrival_span=arrival_span,
+                             stats=multi_stats,
+                             seed=seed)
+
+        print(f"capacity = {capacity}: "
+              f"single {single_stats.throughput:.3f} cars/s (avg wait {single_stats.summary()['avg_wait']:.1f}), "
+              f"multi {multi_stats.throughput:.3f} cars/s (avg wait {multi_stats.summary()['avg_wait']:.1f})")
@@ -1,19 +1,9 @@
-from bridge.multi_threaded import MultiThreadedBridge
-from bridge.single_threaded import SingleThreadedBridge
-from simulation.simulator import run_simulation
+# run_logic.py
+# Однопоточный и многопоточный (потоки на машину) логические мосты на 10 000 машинах;
+# параметры — в scenarios/logic.json. То же самое: python -m simulation scenarios/logic.json
+import os
 
-if __name__ == "__main__":
-    directions = ["left", "right"] * 5000  # 10 000 машин
-    bridge_single = SingleThreadedBridge()
-    run_simulation(bridge_instance=bridge_single,
-                   direction_list=directions,
-                   threaded=False,
-                   output_file="logic_single_results.csv",
-                   arrival_span=10.0)
+from simulation.scenario import load_scenarios, run_scenarios
 
-    bridge_multi = MultiThreadedBridge()
-    run_simulation(bridge_instance=bridge_multi,
-                   direction_list=directions,
-                   threaded=True,
-                   output_file="logic_multi_results.csv",
-                   arrival_span=10.0)
+if __name__ == "__main__":
+    run_scenarios(load_scenarios(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", "logic.json")))
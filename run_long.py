@@ -0,0 +1,23 @@
+# run_long.py
+# Долгий логический прогон с контрольными точками: если его прервать (Ctrl+C,
+# вытеснение с узла), повторный запуск продолжит с последней точки,
+# и файл результатов получится тем же, что и без перерыва.
+from bridge.multi_threaded import MultiThreadedBridge
+from simulation.arrivals import mmpp_arrivals
+from simulation.event_simulator import run_event_simulation
+from simulation.stats import OnlineStats
+
+if __name__ == "__main__":
+    stats = OnlineStats()
+    # Поток прибытий при продолжении должен быть тем же: тот же генератор с тем же seed
+    run_event_simulation(bridge_instance=MultiThreadedBridge(),
+                         direction_list=None,
+                         output_file="long_run_results.bin",
+                         arrival_span=None,
+                         stats=stats,
+                         arrivals=mmpp_arrivals(rates=(0.3, 0.95), mean_durations=(600.0, 120.0),
+                                                num_cars=5_000_000, seed=42),
+                         checkpoint="long_run.ckpt",
+                         checkpoint_every=500_000)
+    summary = stats.summary()
+    print(f"{summary['count']} cars, avg wait = {summary['avg_wait']:.2f}, p99 wait = {summary['p99_wait']:.2f}")
@@ -1,12 +1,10 @@
 # run_multi.py
-from bridge.multi_threaded import MultiThreadedBridge
-from simulation.simulator import run_simulation
+# Логическое время не требует настоящих потоков: 20 000 машин обслуживает
+# дискретно-событийный движок в одном потоке. Параметры — в scenarios/multi.json.
+# То же самое: python -m simulation scenarios/multi.json
+import os
+
+from simulation.scenario import load_scenarios, run_scenarios
 
 if __name__ == "__main__":
-    directions = ["left", "right"] * 10000
-    bridge = MultiThreadedBridge()
-    run_simulation(bridge_instance=bridge,
-                   direction_list=directions,
-                   threaded=True,
-                   output_file="multi_threaded_results.csv",
-                   arrival_span=10.0)
+    run_scenarios(load_scenarios(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", "multi.json")))
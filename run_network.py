@@ -0,0 +1,30 @@
+# run_network.py
+# Коридор из сотни однополосных мостов: машины, выехавшие с одного моста, едут к следующему.
+# Мосты делятся между процессами; результат от числа процессов не зависит.
+import os
+import time
+
+from simulation.network import run_network
+from simulation.stats import OnlineStats
+
+if __name__ == "__main__":
+    num_bridges = 200
+    for processes in sorted({1, os.cpu_count() or 1}):
+        stats = OnlineStats()
+        start = time.time()
+        report = run_network(num_bridges=num_bridges,
+                             rate=0.3,
+                             num_cars=5000,
+                             travel_time=5.0,
+                             processes=processes,
+                             stats=stats,
+                             seed=42)
+        elapsed = time.time() - start
+
+        summary = stats.summary()
+        busiest = max(range(num_bridges), key=lambda i: report["bridges"][i]["avg_wait"])
+        print(f"{processes} process(es): {elapsed:.2f} s, {report['windows']} windows, "
+              f"{report['handoffs']} handoffs between processes")
+        print(f"  cars through the corridor: {summary['count']}, avg total wait {summary['avg_wait']:.2f} s, "
+              f"p99 {summary['p99_wait']:.2f} s")
+        print(f"  busiest bridge: #{busiest}, avg wait {report['bridges'][busiest]['avg_wait']:.2f} s")
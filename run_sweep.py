@@ -0,0 +1,18 @@
+# run_sweep.py
+# Параллельный перебор параметров по всем ядрам
+from simulation.cache import ResultCache
+from simulation.sweep import make_grid, run_sweep
+
+if __name__ == "__main__":
+    cells = make_grid(num_cars=[1000, 10000, 100000],
+                      batch_size=[1, 2, 5, 10, 20],
+                      p_left=[0.3, 0.5],
+                      arrival_span=[1000.0, 10000.0],
+                      seed=[1, 2, 3])
+    # Повторный запуск берёт уже посчитанные ячейки из кеша
+    rows = run_sweep(cells, output_file="sweep_results.csv", cache=ResultCache())
+
+    for row in rows:
+        print(f"{row['engine']:6} n={row['num_cars']:6} batch={row['batch_size'] or '-':>3} p_left={row['p_left']:.1f} "
+              f"span={row['arrival_span']:8.0f} seed={row['seed']}: "
+              f"avg wait = {row['avg_wait']:.2f}, p99 wait = {row['p99_wait']:.2f}")
@@ -0,0 +1,16 @@
+# run_trace.py
+# Временная шкала прогона в формате Chrome trace events:
+# открыть bridge_trace.json в ui.perfetto.dev или chrome://tracing
+from bridge.multi_threaded import MultiThreadedBridge
+from simulation.event_simulator import run_event_simulation
+from simulation.tracing import ChromeTracer
+
+if __name__ == "__main__":
+    directions = ["left", "right"] * 10000
+    with ChromeTracer("bridge_trace.json") as tracer:
+        run_event_simulation(bridge_instance=MultiThreadedBridge(tracer=tracer),
+                             direction_list=directions,
+                             output_file=None,
+                             arrival_span=15000.0,
+                             seed=42)
+    print(f"Трасса сохранена в {tracer.path}: {tracer.events} событий")
@@ -0,0 +1,30 @@
+# project/simulation/__main__.py
+# Запуск сценариев из JSON-файлов:
+#
+#   python -m simulation scenarios/single.json scenarios/multi.json
+#   python -m simulation scenarios/*.json --only multi-event --summary summary.csv
+import argparse
+import sys
+
+from .scenario import load_scenarios, run_scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulation", description="Run bridge simulation scenarios")
+    parser.add_argument("scenarios", nargs="+", help="JSON files with one or more scenarios")
+    parser.add_argument("--only", nargs="+", help="run only scenarios with these names")
+    parser.add_argument("--summary", help="write a CSV table with one summary row per scenario")
+    args = parser.parse_args(argv)
+
+    scenarios = [scenario for path in args.scenarios for scenario in load_scenarios(path)]
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if scenario["name"] in args.only]
+        if not scenarios:
+            print(f"No scenarios named {', '.join(args.only)}")
+            return 2
+    run_scenarios(scenarios, summary_file=args.summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# project/simulation/arrivals.py
+import csv
+import math
+import random
+import struct
+
+from .records import CarTable
+from .sinks import BINARY_MAGIC, BINARY_RECORD, DIRECTIONS, DIRECTION_CODES, is_binary_file
+
+# Источники прибытий — ленивые итераторы машин (car_id, direction, arrival_time)
+# по возрастанию arrival_time. Их можно отдать симуляторам как arrivals=:
+# машины читаются по одной, поэтому память не зависит от длины потока.
+
+# Бинарный журнал прибытий: 8 байт сигнатуры, затем записи по 13 байт
+# car_id:uint32, direction:uint8, arrival:float64, little-endian, без выравнивания
+ARRIVAL_MAGIC = b"BRGARR1\n"
+ARRIVAL_RECORD = struct.Struct("<IBd")
+ARRIVAL_HEADER = ["CarID", "Direction", "ArrivalTime"]
+
+# Сколько записей бинарного журнала разбирается за раз
+CHUNK_RECORDS = 1 << 16
+
+
+def make_rng(seed):
+    return random.Random(seed) if seed is not None else random
+
+
+def pick_direction(rng, p_left: float) -> str:
+    return "left" if rng.random() < p_left else "right"
+
+
+def uniform_arrivals(num_cars: int, arrival_span: float, p_left: float = 0.5, seed: int = None):
+    """
+    num_cars прибытий, равномерных на [0, arrival_span), сразу по возрастанию.
+    Порядковые статистики строятся последовательно:
+        U(i) = 1 - (1 - U(i-1)) * V^(1 / (n - i + 1)),
+    поэтому сортировать (и хранить) все времена не нужно.
+    """
+    rng = make_rng(seed)
+    position = 0.0
+    for i in range(num_cars):
+        position = 1.0 - (1.0 - position) * rng.random() ** (1.0 / (num_cars - i))
+        yield i + 1, pick_direction(rng, p_left), position * arrival_span
+
+
+def poisson_arrivals(rate: float, num_cars: int = None, duration: float = None,
+                     p_left: float = 0.5, seed: int = None):
+    """
+    Пуассоновский поток с интенсивностью rate машин в секунду.
+    Останавливается после num_cars машин или на времени duration — что наступит раньше.
+    """
+    check_limits(num_cars, duration)
+    rng = make_rng(seed)
+    arrival_time = 0.0
+    car_id = 0
+    while num_cars is None or car_id < num_cars:
+        arrival_time += rng.expovariate(rate)
+        if duration is not None and arrival_time >= duration:
+            return
+        car_id += 1
+        yield car_id, pick_direction(rng, p_left), arrival_time
+
+
+def mmpp_arrivals(rates=(0.2, 2.0), mean_durations=(600.0, 60.0), num_cars: int = None, duration: float = None,
+                  p_left: float = 0.5, seed: int = None):
+    """
+    Пачечный поток (MMPP): скрытое состояние i длится экспоненциальное время
+    со средним mean_durations[i], и в нём машины идут пуассоновским потоком
+    с интенсивностью rates[i]. Состояния сменяются по кругу.
+    По умолчанию — спокойные десять минут и минута часа пик.
+    """
+    check_limits(num_cars, duration)
+    if len(rates) != len(mean_durations):
+        raise ValueError("rates and mean_durations must have the same length")
+    rng = make_rng(seed)
+    state = 0
+    state_end = rng.expovariate(1.0 / mean_durations[state])
+    arrival_time = 0.0
+    car_id = 0
+    while num_cars is None or car_id < num_cars:
+        gap = rng.expovariate(rates[state]) if rates[state] > 0 else math.inf
+        if arrival_time + gap >= state_end:
+            # Поток без памяти: в новом состоянии отсчёт начинается с момента переключения
+            arrival_time = state_end
+            state = (state + 1) % len(rates)
+            state_end = arrival_time + rng.expovariate(1.0 / mean_durations[state])
+            if duration is not None and arrival_time >= duration:
+                return
+            continue
+        arrival_time += gap
+        if duration is not None and arrival_time >= duration:
+            return
+        car_id += 1
+        yield car_id, pick_direction(rng, p_left), arrival_time
+
+
+def diurnal_arrivals(mean_rate: float, amplitude: float = 0.8, period: float = 86400.0, phase: float = 0.0,
+                     num_cars: int = None, duration: float = None, p_left: float = 0.5, seed: int = None):
+    """
+    Суточный профиль: неоднородный пуассоновский поток с интенсивностью
+        rate(t) = mean_rate * (1 + amplitude * sin(2*pi*t / period + phase)).
+    Строится прореживанием потока с максимальной интенсивностью.
+    """
+    check_limits(num_cars, duration)
+    if not 0.0 <= amplitude <= 1.0:
+        raise ValueError("amplitude must be between 0 and 1")
+    rng = make_rng(seed)
+    max_rate = mean_rate * (1.0 + amplitude)
+    omega = 2.0 * math.pi / period
+    arrival_time = 0.0
+    car_id = 0
+    while num_cars is None or car_id < num_cars:
+        arrival_time += rng.expovariate(max_rate)
+        if duration is not None and arrival_time >= duration:
+            return
+        rate = mean_rate * (1.0 + amplitude * math.sin(omega * arrival_time + phase))
+        if rng.random() * max_rate < rate:
+            car_id += 1
+            yield car_id, pick_direction(rng, p_left), arrival_time
+
+
+def check_limits(num_cars, duration):
+    if num_cars is None and duration is None:
+        raise ValueError("either num_cars or duration must be given")
+
+
+def write_arrival_log(path: str, cars) -> int:
+    """
+    Сохраняет поток прибытий в журнал (.bin/.brg — бинарный, иначе CSV).
+    Поток пишется по мере чтения, поэтому годится и для миллионов машин.
+    Возвращает число записанных машин.
+    """
+    count = 0
+    if is_binary_file(path):
+        pack = ARRIVAL_RECORD.pack
+        with open(path, "wb", buffering=1 << 20) as f:
+            f.write(ARRIVAL_MAGIC)
+            for car_id, direction, arrival_time in cars:
+                f.write(pack(car_id, DIRECTION_CODES[direction], arrival_time))
+                count += 1
+    else:
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(ARRIVAL_HEADER)
+            for car in cars:
+                writer.writerow(car)
+                count += 1
+    return count
+
+
+def replay_arrivals(path: str):
+    """
+    Проигрывает записанный журнал прибытий, читая его по мере надобности.
+    Понимает CSV с колонками CarID, Direction, ArrivalTime и бинарный журнал прибытий;
+    бинарный файл читается и разбирается кусками по CHUNK_RECORDS записей.
+    Журнал должен быть упорядочен по времени прибытия, иначе — ValueError.
+    Файл результатов симуляции (CSV или бинарный) записан в порядке выезда, а не прибытия:
+    его машины читаются целиком в CarTable (13 байт на машину) и упорядочиваются по прибытию.
+    """
+    if is_results_file(path):
+        yield from results_arrivals(path)
+        return
+    cars = replay_binary(path) if is_binary_file(path) else replay_csv(path)
+    last_time = -math.inf
+    for car in cars:
+        if car[2] < last_time:
+            raise ValueError(f"{path} is not sorted by arrival time (car {car[0]})")
+        last_time = car[2]
+        yield car
+
+
+def is_results_file(path: str) -> bool:
+    if is_binary_file(path):
+        with open(path, "rb") as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    with open(path, "r", newline='') as f:
+        return "WaitingTime" in next(csv.reader(f), [])
+
+
+def results_arrivals(path: str):
+    """Машины файла результатов в порядке прибытия; при равном времени — по car_id, как у генераторов."""
+    table = CarTable()
+    for car in (replay_binary(path) if is_binary_file(path) else replay_csv(path)):
+        table.append(*car)
+    table.sort_by_car()
+    table.sort_by_arrival()
+    return table
+
+
+def replay_csv(path: str):
+    with open(path, "r", newline='') as f:
+        for row in csv.DictReader(f):
+            yield int(row["CarID"]), row["Direction"], float(row["ArrivalTime"])
+
+
+def replay_binary(path: str):
+    with open(path, "rb") as f:
+        magic = f.read(len(ARRIVAL_MAGIC))
+        if magic == ARRIVAL_MAGIC:
+            record, fields = ARRIVAL_RECORD, (0, 1, 2)
+        elif magic == BINARY_MAGIC:
+            record, fields = BINARY_RECORD, (0, 1, 4)
+        else:
+            raise ValueError(f"{path} is not a bridge arrival log or results file")
+        car_field, direction_field, time_field = fields
+        chunk = record.size * CHUNK_RECORDS
+        while True:
+            # Кусками фиксированного размера: в памяти не больше одного куска,
+            # в отличие от mmap, где прочитанные страницы остаются в RSS
+            data = f.read(chunk)
+            data = data[:len(data) // record.size * record.size]
+            if not data:
+                return
+            for values in record.iter_unpack(data):
+                yield values[car_field], DIRECTIONS[values[direction_field]], values[time_field]
@@ -0,0 +1,276 @@
+# project/simulation/benchmark.py
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bridge.async_bridge import AsyncBridge
+from bridge.clock import VirtualClock
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.real_multi_threaded import RealMultiThreadedBridge
+from bridge.real_single_threaded import RealSingleThreadedBridge
+from bridge.shared_memory import SharedMemoryBridge
+from bridge.single_threaded import SingleThreadedBridge
+
+from .cache import code_version
+from .event_simulator import run_event_simulation
+from .network import run_network
+from .process_simulator import run_process_simulation
+from .real_simulator import run_real_simulation, run_real_simulation_async
+from .resources import ResourceMonitor, peak_rss_mb
+from .simulator import run_simulation, run_vectorized_simulation
+
+# Загрузка моста во всех случаях одна и та же: машина приезжает в среднем раз в 1/LOAD секунды
+LOAD = 0.9
+# Проезд по мосту в asyncio-случае: он идёт по настоящим часам, поэтому укорочен
+ASYNC_CROSSING_TIME = 0.002
+
+SCALES = (1000, 10000, 100000)
+
+# Коридор в сетевых случаях: столько мостов, дорога между ними — NETWORK_TRAVEL_TIME
+NETWORK_BRIDGES = 100
+NETWORK_TRAVEL_TIME = 5.0
+
+
+# Каждый случай возвращает (мост, usage): usage — то, что вернул симулятор, если он следит за ресурсами
+
+def bench_single_sequential(directions, seed):
+    bridge = SingleThreadedBridge()
+    return bridge, run_simulation(bridge, directions, False, None, len(directions) / LOAD, seed=seed)
+
+
+def bench_single_vectorized(directions, seed):
+    bridge = SingleThreadedBridge()
+    run_vectorized_simulation(bridge, directions, None, len(directions) / LOAD, seed=seed)
+    return bridge, None
+
+
+def bench_multi_event(directions, seed):
+    bridge = MultiThreadedBridge()
+    run_event_simulation(bridge, directions, None, len(directions) / LOAD, seed=seed)
+    return bridge, None
+
+
+def bench_multi_pool(directions, seed):
+    bridge = MultiThreadedBridge(per_direction=True)
+    return bridge, run_simulation(bridge, directions, True, None, len(directions) / LOAD, workers=8, seed=seed)
+
+
+def bench_shared_process_pool(directions, seed):
+    # close() копирует счётчики из общей памяти, так что snapshot() доступен и после него
+    with SharedMemoryBridge(per_direction=True) as bridge:
+        run_process_simulation(bridge, directions, None, len(directions) / LOAD, processes=8, seed=seed)
+    return bridge, None
+
+
+def bench_multi_thread_per_car(directions, seed):
+    bridge = MultiThreadedBridge()
+    return bridge, run_simulation(bridge, directions, True, None, len(directions) / LOAD, seed=seed)
+
+
+def bench_real_single_virtual(directions, seed):
+    bridge = RealSingleThreadedBridge(clock=VirtualClock())
+    return bridge, run_real_simulation(bridge, directions, False, None, len(directions) / LOAD, seed=seed)
+
+
+def bench_real_multi_virtual(directions, seed):
+    bridge = RealMultiThreadedBridge(per_direction=True, clock=VirtualClock())
+    return bridge, run_real_simulation(bridge, directions, True, None, len(directions) / LOAD, workers=8, seed=seed)
+
+
+def bench_async(directions, seed):
+    bridge = AsyncBridge(crossing_time=ASYNC_CROSSING_TIME)
+    run_real_simulation_async(bridge, directions, None, len(directions) * ASYNC_CROSSING_TIME / LOAD, seed=seed)
+    return bridge, None
+
+
+def bench_network(processes: int):
+    # Один и тот же коридор на 1 и на нескольких процессах: результат одинаков,
+    # разница во времени — выигрыш (или цена) от раздачи участков по процессам
+    def case(directions, seed):
+        run_network(NETWORK_BRIDGES, LOAD, len(directions), travel_time=NETWORK_TRAVEL_TIME,
+                    processes=processes, seed=seed)
+        return None, None
+    return case
+
+
+# Случай бенчмарка: имя -> (функция, максимальный масштаб).
+# Максимум ограничивает дорогие случаи: поток на машину, виртуальные и настоящие часы.
+CASES = {
+    "single/sequential": (bench_single_sequential, None),
+    "single/vectorized": (bench_single_vectorized, None),
+    "multi/event": (bench_multi_event, None),
+    "multi/thread-pool": (bench_multi_pool, 10000),
+    "multi/thread-per-car": (bench_multi_thread_per_car, 10000),
+    "shared/process-pool": (bench_shared_process_pool, 10000),
+    "real-single/virtual-clock": (bench_real_single_virtual, 10000),
+    "real-multi/virtual-clock": (bench_real_multi_virtual, 10000),
+    "async/real-clock": (bench_async, 1000),
+    "network/1-process": (bench_network(1), 10000),
+    "network/4-processes": (bench_network(4), 10000),
+}
+
+
+def run_case(task):
+    """
+    Прогоняет один случай repeats раз и возвращает строку результатов.
+    Запускается в отдельном процессе, поэтому пиковый RSS относится только к этому случаю.
+    """
+    name, num_cars, repeats, seed = task
+    function, _ = CASES[name]
+    rng = random.Random(f"directions-{seed}")
+    directions = [rng.choice(["left", "right"]) for _ in range(num_cars)]
+
+    # Прогрев: импорты (NumPy, asyncio) и первые аллокации не должны попадать в замер
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(directions[:100], seed)
+
+    wall_times = []
+    peak_threads = 1
+    wakeups = futile_wakeups = None
+    for _ in range(repeats):
+        sampler_done = threading.Event()
+
+        def sampler():
+            # Потоки симуляторов бывают недолгими, поэтому пик замеряем ещё и со стороны
+            while not sampler_done.wait(0.005):
+                monitor.sample()
+
+        monitor = ResourceMonitor()
+        watcher = threading.Thread(target=sampler, daemon=True)
+        watcher.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            bridge, usage = function(directions, seed)
+        wall_times.append(time.perf_counter() - start)
+        sampler_done.set()
+        watcher.join()
+        # Поток-наблюдатель жил всё время прогона — его не считаем
+        peak_threads = max(peak_threads, monitor.peak_threads - 1)
+        if usage is not None:
+            peak_threads = max(peak_threads, usage["peak_threads"] - 1)
+        if hasattr(bridge, "wakeups"):
+            wakeups, futile_wakeups = bridge.wakeups, bridge.futile_wakeups
+
+    wall_time = statistics.median(wall_times)
+    return {
+        "case": name,
+        "cars": num_cars,
+        "repeats": repeats,
+        "wall_time": wall_time,
+        "min_wall_time": min(wall_times),
+        "cars_per_sec": num_cars / wall_time if wall_time > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_threads": peak_threads,
+        "wakeups": wakeups,
+        "futile_wakeups": futile_wakeups,
+    }
+
+
+def select_cases(patterns=None):
+    """Имена случаев, содержащие хотя бы одну из подстрок patterns (все, если patterns пуст)."""
+    if not patterns:
+        return list(CASES)
+    return [name for name in CASES if any(pattern in name for pattern in patterns)]
+
+
+def run_benchmarks(cases=None, scales=SCALES, repeats: int = 3, seed: int = 0, output_file: str = None):
+    """
+    Прогоняет случаи на всех масштабах (кроме тех, что выше максимума случая).
+    Каждый прогон — в свежем процессе (spawn), чтобы RSS и потоки не копились между случаями.
+    Возвращает отчёт {"meta": ..., "results": [...]}; если задан output_file — сохраняет его в JSON.
+    """
+    tasks = []
+    for name in cases or CASES:
+        _, max_scale = CASES[name]
+        for num_cars in scales:
+            if max_scale is None or num_cars <= max_scale:
+                tasks.append((name, num_cars, repeats, seed))
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for task in tasks:
+        # Не multiprocessing.Pool: его рабочие — демоны и не могут запускать
+        # свои процессы, а случаю shared/process-pool они нужны
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                row = pool.submit(run_case, task).result()
+            except ImportError as e:
+                # Например, векторизованный случай без NumPy
+                print(f"{task[0]:28} {task[1]:>8}: skipped ({e})")
+                continue
+        results.append(row)
+        print(format_row(row))
+
+    report = {
+        "meta": {
+            "code_version": code_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeats": repeats,
+            "seed": seed,
+        },
+        "results": results,
+    }
+    if output_file:
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark results saved to {output_file}")
+    return report
+
+
+def format_row(row):
+    wakeups = "" if row["wakeups"] is None else f", wakeups {row['wakeups']} ({row['futile_wakeups']} futile)"
+    return (f"{row['case']:28} {row['cars']:>8}: {row['cars_per_sec']:>12.0f} cars/s, "
+            f"{row['wall_time']:8.3f} s, RSS {row['peak_rss_mb']:6.1f} MB, threads {row['peak_threads']}{wakeups}")
+
+
+def load_report(filename: str):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, threshold: float = 0.10, rss_threshold: float = 0.25):
+    """
+    Сравнивает два отчёта по общим (случай, масштаб).
+    Регрессия — если машин в секунду стало меньше больше чем на threshold,
+    пиковый RSS вырос больше чем на rss_threshold или пробуждений стало больше
+    больше чем на threshold. Возвращает (строки сравнения, список регрессий).
+    """
+    base_rows = {(row["case"], row["cars"]): row for row in baseline["results"]}
+    rows = []
+    regressions = []
+    for row in current["results"]:
+        base = base_rows.get((row["case"], row["cars"]))
+        if base is None:
+            continue
+        checks = [
+            ("cars_per_sec", relative_change(base["cars_per_sec"], row["cars_per_sec"]), -threshold),
+            ("peak_rss_mb", relative_change(base["peak_rss_mb"], row["peak_rss_mb"]), rss_threshold),
+        ]
+        if base["wakeups"] is not None and row["wakeups"] is not None:
+            checks.append(("wakeups", relative_change(base["wakeups"], row["wakeups"]), threshold))
+
+        compared = {"case": row["case"], "cars": row["cars"]}
+        for metric, change, limit in checks:
+            compared[metric] = change
+            # Для скорости плохо падение, для памяти и пробуждений — рост
+            if (limit < 0 and change < limit) or (limit > 0 and change > limit):
+                regressions.append((row["case"], row["cars"], metric, base[metric], row[metric], change))
+        rows.append(compared)
+    return rows, regressions
+
+
+def relative_change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old
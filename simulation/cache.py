@@ -0,0 +1,96 @@
+# project/simulation/cache.py
+import hashlib
+import json
+import os
+from pathlib import Path
+
+_code_version = None
+
+
+def code_version() -> str:
+    """
+    Хеш исходников пакетов bridge и simulation: любое изменение кода
+    моста или симулятора делает старые записи кеша недостижимыми.
+    """
+    global _code_version
+    if _code_version is None:
+        root = Path(__file__).resolve().parent.parent
+        digest = hashlib.sha256()
+        for package in ("bridge", "simulation"):
+            for path in sorted((root / package).glob("*.py")):
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+class ResultCache:
+    """
+    Кеш результатов прогонов на диске: один JSON-файл на ключ.
+    Ключ — хеш (класс моста, batch_size, направления, arrival_span, seed, версия кода).
+    При превышении max_bytes удаляются давно не использованные записи.
+    Кешировать имеет смысл только прогоны с явным seed.
+    """
+
+    def __init__(self, cache_dir: str = ".sim_cache", max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, bridge_class: str, batch_size, directions, arrival_span: float, seed: int) -> str:
+        """
+        directions — список направлений (хешируется) или любое JSON-описание того,
+        как они получаются (например, {"num_cars": ..., "p_left": ...} при известном seed).
+        """
+        if isinstance(directions, (list, tuple)):
+            directions = hashlib.sha256("".join(d[0] for d in directions).encode()).hexdigest()
+        payload = json.dumps({
+            "bridge_class": bridge_class,
+            "batch_size": batch_size,
+            "directions": directions,
+            "arrival_span": arrival_span,
+            "seed": seed,
+            "code_version": code_version(),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str):
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Обновляем mtime: по нему решаем, что вытеснять
+        os.utime(path)
+        return value
+
+    def put(self, key: str, value):
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,76 @@
+# project/simulation/checkpoint.py
+import hashlib
+import os
+import pickle
+
+from .cache import code_version
+
+# Поля моста, которые относятся к исполнению, а не к логическому состоянию:
+# замки и условные переменные не сериализуются, metrics, tracer и часы остаются у вызывающего кода
+RUNTIME_FIELDS = ("lock", "condition", "condition_left", "condition_right", "leave_turn", "parked",
+                  "metrics", "tracer", "clock")
+
+
+def save_checkpoint(path: str, state):
+    """Записывает контрольную точку атомарно: прерванная запись не портит предыдущую точку."""
+    state = dict(state, code_version=code_version())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, run_key):
+    """
+    Контрольная точка по пути или None, если её нет.
+    run_key — описание прогона (мост, число машин, seed...): точка от другого прогона
+    или от другой версии кода не продолжается, а даёт ValueError.
+    """
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("code_version") != code_version():
+        raise ValueError(f"Checkpoint {path} was written by a different version of the code")
+    if state.get("run_key") != run_key:
+        raise ValueError(f"Checkpoint {path} belongs to a different run: {state.get('run_key')}")
+    return state
+
+
+def clear_checkpoint(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def bridge_state(bridge_instance):
+    """Логическое состояние моста: направление, счётчики партии, next_available_time_*, очереди колонны."""
+    return {name: value for name, value in vars(bridge_instance).items() if name not in RUNTIME_FIELDS}
+
+
+def restore_bridge(bridge_instance, state):
+    for name, value in state.items():
+        setattr(bridge_instance, name, value)
+
+
+def restore_stats(stats, saved):
+    """Переносит накопленную статистику (OnlineStats и т.п.) в объект, который передал вызывающий код."""
+    if stats is not None and saved is not None:
+        vars(stats).update(vars(saved))
+
+
+def run_key(bridge_instance, direction_list, arrival_span, seed, arrivals):
+    """
+    Описание прогона для проверки при продолжении. Поток arrivals сравнить нельзя:
+    продолжая, его нужно передать тем же (например, тот же генератор с тем же seed).
+    """
+    return {
+        "bridge": type(bridge_instance).__name__,
+        "num_cars": None if arrivals is not None else len(direction_list),
+        "directions": None if arrivals is not None
+        else hashlib.sha256("".join(d[0] for d in direction_list).encode()).hexdigest(),
+        "arrival_span": arrival_span,
+        "seed": seed,
+    }
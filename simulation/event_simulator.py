@@ -0,0 +1,217 @@
+# project/simulation/event_simulator.py
+import heapq
+import itertools
+import math
+import random
+from collections import deque
+from typing import List
+
+from .checkpoint import bridge_state, clear_checkpoint, load_checkpoint, restore_bridge, restore_stats, run_key, \
+    save_checkpoint
+from .records import CarTable
+from .sinks import dump_metrics, open_sink
+
+# Типы событий. При равном времени выезд обрабатывается раньше прибытия,
+# чтобы мост успел освободиться и принять решение о направлении.
+LEAVE = 0
+ARRIVAL = 1
+
+
+class EventSimulator:
+    """
+    Дискретно-событийный движок логической симуляции.
+    Вместо потока на каждую машину все события (прибытие, выезд) идут
+    через очередь с приоритетом в одном потоке. Решения о въезде и
+    переключении направления принимает сам мост (try_enter / leave),
+    поэтому батчинг работает так же, как в MultiThreadedBridge.
+
+    Машина считается ожидающей, только если она уже прибыла по логическому
+    времени, так что результат не зависит от планировщика ОС.
+    """
+
+    def __init__(self, bridge_instance, on_result):
+        self.bridge = bridge_instance
+        self.on_result = on_result  # on_result(car_id, direction, wait, cross, arrival)
+        self.events = []            # куча (time, kind, seq, payload)
+        self.seq = 0
+        self.queues = {"left": deque(), "right": deque()}
+        self.source = None
+        self.pending = None         # следующая машина из источника
+        self.consumed = 0           # сколько машин источника уже прибыло
+        self.now = 0.0
+
+    def feed(self, cars):
+        """
+        Подключает источник машин (car_id, direction, arrival_time),
+        отсортированный по времени прибытия. Источник читается лениво,
+        поэтому в куче никогда не лежат все машины сразу.
+        """
+        self.source = iter(cars)
+        self.pending = next(self.source, None)
+
+    def schedule_arrival(self, car_id: int, direction: str, arrival_time: float):
+        self._push(arrival_time, ARRIVAL, (car_id, direction, arrival_time))
+
+    def run(self, until: float = None, max_cars: int = None):
+        """
+        Обрабатывает события по возрастанию времени.
+        Если задан until, останавливается на первом событии с time >= until,
+        если задан max_cars — перед прибытием машины, когда из источника уже прочитано
+        max_cars машин (например, чтобы сохранить контрольную точку).
+        """
+        events = self.events
+        max_cars = math.inf if max_cars is None else max_cars
+        while True:
+            if events and (self.pending is None or events[0][0] <= self.pending[2]):
+                time = events[0][0]
+                if until is not None and time >= until:
+                    return
+                _, kind, _, payload = heapq.heappop(events)
+                self.now = time
+                if kind == LEAVE:
+                    self._leave(*payload)
+                else:
+                    self._arrive(*payload)
+            elif self.pending is not None:
+                car = self.pending
+                if (until is not None and car[2] >= until) or self.consumed >= max_cars:
+                    return
+                self.pending = next(self.source, None)
+                self.consumed += 1
+                self.now = car[2]
+                self._arrive(*car)
+            else:
+                return
+
+    def state(self):
+        """Состояние движка для контрольной точки; источник машин сохраняется числом прочитанных машин."""
+        return {"events": self.events, "seq": self.seq, "queues": self.queues,
+                "consumed": self.consumed, "now": self.now}
+
+    def restore(self, state):
+        """
+        Продолжение с контрольной точки. Источник должен быть подключён через feed()
+        и давать те же машины, что и в прерванном прогоне: уже прибывшие пропускаются.
+        """
+        self.events = state["events"]
+        self.seq = state["seq"]
+        self.queues = state["queues"]
+        self.now = state["now"]
+        self.consumed = state["consumed"]
+        if self.consumed:
+            # pending — первая машина источника; пропускаем ещё consumed - 1
+            self.pending = next(itertools.islice(self.source, self.consumed - 1, None), None)
+
+    def next_time(self) -> float:
+        """Время ближайшего события (из кучи или из источника); inf, если событий не осталось."""
+        event_time = self.events[0][0] if self.events else math.inf
+        return min(event_time, self.pending[2]) if self.pending is not None else event_time
+
+    def _push(self, time: float, kind: int, payload):
+        self.seq += 1
+        heapq.heappush(self.events, (time, kind, self.seq, payload))
+
+    def _arrive(self, car_id: int, direction: str, arrival_time: float):
+        queue = self.queues[direction]
+        if not queue:
+            enter_time = self.bridge.try_enter(direction, arrival_time)
+            if enter_time is not None:
+                self._start_crossing(car_id, direction, arrival_time, enter_time)
+                return
+        queue.append((car_id, arrival_time))
+        self.bridge.mark_waiting(direction, 1, arrival_time)
+
+    def _start_crossing(self, car_id: int, direction: str, arrival_time: float, enter_time: float):
+        self._push(enter_time + self.bridge.crossing_time, LEAVE,
+                   (car_id, direction, arrival_time, enter_time))
+
+    def _leave(self, car_id: int, direction: str, arrival_time: float, enter_time: float):
+        leave_time = self.bridge.leave(enter_time)
+        self.on_result(car_id, direction, enter_time - arrival_time, leave_time - enter_time, arrival_time)
+        self._admit()
+
+    def _admit(self):
+        # После выезда мост уже выбрал направление; пускаем голову его очереди
+        direction = self.bridge.current_direction
+        if direction is None:
+            return
+        queue = self.queues[direction]
+        while queue:
+            car_id, arrival_time = queue[0]
+            enter_time = self.bridge.try_enter(direction, arrival_time)
+            if enter_time is None:
+                break
+            queue.popleft()
+            self.bridge.mark_waiting(direction, -1, arrival_time)
+            self._start_crossing(car_id, direction, arrival_time, enter_time)
+
+
+def run_event_simulation(bridge_instance, direction_list: List[str], output_file: str, arrival_span: float,
+                         stats=None, seed: int = None, arrivals=None, tracer=None,
+                         checkpoint: str = None, checkpoint_every: int = 1_000_000):
+    """
+    Логическая симуляция без потоков: тот же MultiThreadedBridge,
+    но машины обслуживаются дискретно-событийным движком.
+    Результаты пишутся в output_file (путь .csv/.bin, ResultSink или None) по мере выезда машин,
+    stats (например, OnlineStats) получает те же записи.
+    arrivals — готовый поток машин по возрастанию времени (см. simulation.arrivals):
+    движок читает его лениво, так что память не растёт с длиной потока.
+    tracer (ChromeTracer; по умолчанию — tracer моста) получает временную шкалу прогона.
+    checkpoint — путь контрольной точки: каждые checkpoint_every машин туда сохраняются
+    движок, мост, stats и позиция в output_file. Если точка уже есть, прогон продолжается
+    с неё и даёт тот же результат, что и непрерванный; после завершения точка удаляется.
+    """
+    state = None
+    if checkpoint is not None:
+        if tracer is not None or getattr(bridge_instance, "tracer", None) is not None:
+            raise ValueError("checkpoints do not support tracing")
+        key = run_key(bridge_instance, direction_list, arrival_span, seed, arrivals)
+        state = load_checkpoint(checkpoint, key)
+
+    if arrivals is not None:
+        cars = arrivals
+    else:
+        # seed=None — глобальный random, как раньше; иначе свой генератор на прогон
+        rng = random.Random(seed) if seed is not None else random
+        if state is not None and seed is None:
+            # Без seed времена прибытия повторяются из сохранённого состояния глобального random
+            random.setstate(state["random"])
+        random_state = random.getstate() if seed is None else None
+        cars = CarTable.uniform(direction_list, arrival_span, rng)
+
+    sink, owned_sink = open_sink(output_file, stats, tracer or getattr(bridge_instance, "tracer", None),
+                                 resume_at=state["output_position"] if state is not None else None)
+    try:
+        simulator = EventSimulator(bridge_instance, sink.write)
+        simulator.feed(cars)
+        if state is not None:
+            simulator.restore(state["engine"])
+            restore_bridge(bridge_instance, state["bridge"])
+            restore_stats(stats, state["stats"])
+            print(f"Продолжение с контрольной точки {checkpoint}: {simulator.consumed} машин уже прибыло")
+
+        if checkpoint is None:
+            simulator.run()
+        else:
+            while True:
+                simulator.run(max_cars=simulator.consumed + checkpoint_every)
+                if simulator.next_time() == math.inf:
+                    break
+                save_checkpoint(checkpoint, {
+                    "run_key": key,
+                    "engine": simulator.state(),
+                    "bridge": bridge_state(bridge_instance),
+                    "stats": stats,
+                    "output_position": sink.position(),
+                    "random": random_state if arrivals is None else None,
+                })
+    finally:
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"Результаты сохранены в {output_file}")
+    if checkpoint is not None:
+        clear_checkpoint(checkpoint)
+    metrics_path = dump_metrics(bridge_instance, output_file)
+    if metrics_path:
+        print(f"Метрики моста сохранены в {metrics_path}")
@@ -0,0 +1,237 @@
+# project/simulation/network.py
+import math
+import multiprocessing
+import os
+import random
+
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.policies import make_policy
+
+from .arrivals import poisson_arrivals
+from .event_simulator import EventSimulator
+from .sinks import open_sink
+from .stats import OnlineStats
+
+# Коридор — цепочка мостов 0..N-1, между соседними мостами дорога с временем проезда travel_time.
+# Машины "left" въезжают в коридор у моста 0 и едут к мосту N-1, машины "right" — наоборот.
+# Мост i с мостом i+1 соединяет дорога i.
+
+
+class Segment:
+    """
+    Участок коридора: мосты first..last-1 со своими событийными движками.
+    Машина, выехавшая с моста, прибывает к следующему через travel_time.
+    Если следующий мост на этом же участке, прибытие ставится в его движок
+    в начале следующего окна, иначе уходит в outgoing и передаётся соседнему
+    участку пачкой в конце окна.
+    """
+
+    def __init__(self, first: int, last: int, config):
+        self.first = first
+        self.last = last
+        self.num_bridges = config["num_bridges"]
+        self.travel_times = config["travel_times"]
+        self.simulators = {}
+        self.bridge_stats = {}
+        for index in range(first, last):
+            bridge = MultiThreadedBridge(policy=make_policy(config["policy"], **config["policy_params"]),
+                                         capacity=config["capacity"], headway=config["headway"],
+                                         crossing_time=config["crossing_time"])
+            self.simulators[index] = EventSimulator(bridge, self.make_on_result(index))
+            self.bridge_stats[index] = OnlineStats()
+
+        # Внешние прибытия: один и тот же поток (то же зерно) на обоих концах коридора,
+        # каждый конец берёт машины своего направления
+        if first == 0:
+            self.simulators[0].feed(external_arrivals(config, None if self.num_bridges == 1 else "left"))
+        if last == self.num_bridges and self.num_bridges > 1:
+            self.simulators[last - 1].feed(external_arrivals(config, "right"))
+
+        self.in_flight = {}  # car_id -> (время въезда в коридор, суммарное ожидание)
+        self.outgoing = []   # (мост, car_id, direction, arrival_time, start_time, waited)
+        self.deferred = []   # то же для мостов этого участка
+        self.journeys = []   # машины, проехавшие весь коридор, в формате результатов
+
+    def make_on_result(self, index: int):
+        def on_result(car_id, direction, wait_time, crossing_time, arrival_time):
+            self.on_leave(index, car_id, direction, wait_time, crossing_time, arrival_time)
+        return on_result
+
+    def on_leave(self, index, car_id, direction, wait_time, crossing_time, arrival_time):
+        leave_time = arrival_time + wait_time + crossing_time
+        start_time, waited = self.in_flight.pop(car_id, (arrival_time, 0.0))
+        waited += wait_time
+        self.bridge_stats[index].write(car_id, direction, wait_time, crossing_time, arrival_time)
+
+        target = index + 1 if direction == "left" else index - 1
+        if not 0 <= target < self.num_bridges:
+            # Коридор пройден: ожидание суммарное, "проезд" — всё остальное время пути
+            self.journeys.append((car_id, direction, waited, leave_time - start_time - waited, start_time))
+            return
+        handoff = (target, car_id, direction, leave_time + self.travel_times[min(index, target)], start_time, waited)
+        if self.first <= target < self.last:
+            self.deferred.append(handoff)
+        else:
+            self.outgoing.append(handoff)
+
+    def step(self, until: float, incoming):
+        """
+        Принимает машины от соседей и прогоняет все мосты участка до until.
+        Возвращает (outgoing, journeys, время ближайшего события участка).
+        """
+        # Свои и чужие прибытия ставятся вместе в порядке (время, машина): при равных временах
+        # порядок не зависит от того, как мосты поделены между процессами
+        arrivals = sorted(incoming + self.deferred, key=lambda car: (car[3], car[1]))
+        self.deferred = []
+        for index, car_id, direction, arrival_time, start_time, waited in arrivals:
+            self.in_flight[car_id] = (start_time, waited)
+            self.simulators[index].schedule_arrival(car_id, direction, arrival_time)
+        # Мосты без событий в окне пропускаем
+        next_time = math.inf
+        for simulator in self.simulators.values():
+            if simulator.next_time() < until:
+                simulator.run(until)
+            next_time = min(next_time, simulator.next_time())
+        outgoing, journeys = self.outgoing, self.journeys
+        self.outgoing, self.journeys = [], []
+        if self.deferred:
+            next_time = min(next_time, min(car[3] for car in self.deferred))
+        return outgoing, journeys, next_time
+
+    def summaries(self):
+        return [self.bridge_stats[index].summary() for index in range(self.first, self.last)]
+
+
+def external_arrivals(config, direction):
+    cars = poisson_arrivals(config["rate"], config["num_cars"], p_left=config["p_left"], seed=config["seed"])
+    return cars if direction is None else (car for car in cars if car[1] == direction)
+
+
+def segment_worker(conn, first: int, last: int, config):
+    """Процесс участка: на каждое окно получает (until, incoming) и отвечает результатом step()."""
+    segment = Segment(first, last, config)
+    while True:
+        message = conn.recv()
+        if message is None:
+            conn.send(segment.summaries())
+            conn.close()
+            return
+        conn.send(segment.step(*message))
+
+
+def run_network(num_bridges: int, rate: float, num_cars: int, travel_time=5.0, p_left: float = 0.5,
+                processes: int = None, output_file=None, stats=None, seed: int = None,
+                policy: str = "fixed_batch", policy_params=None, capacity: int = 1, headway: float = None,
+                crossing_time: float = 1.0):
+    """
+    Симуляция коридора из num_bridges однополосных мостов.
+    - rate, num_cars, p_left: внешний пуассоновский поток машин; машины "left" въезжают
+      у моста 0, "right" — у моста num_bridges-1
+    - travel_time: время проезда между соседними мостами (одно на все дороги или список
+      из num_bridges-1 значений)
+    - processes: число процессов; мосты делятся между ними непрерывными участками
+    - output_file / stats: куда писать машины, проехавшие весь коридор: ожидание суммарное,
+      "проезд" — остальное время пути, прибытие — въезд в коридор
+    - policy, policy_params, capacity, headway, crossing_time: параметры каждого моста
+
+    Участки идут окнами длиной в минимальное время проезда между мостами:
+    машина, выехавшая в окне, доедет до соседа не раньше конца окна,
+    поэтому внутри окна участки независимы и работают параллельно,
+    а машины между участками передаются пачкой раз за окно. Пустые окна
+    пропускаются: следующее начинается с ближайшего события во всём коридоре.
+    Результат не зависит от числа процессов.
+    Возвращает сводки OnlineStats по мостам и счётчики окон и передач.
+    """
+    if num_bridges < 1:
+        raise ValueError("num_bridges must be at least 1")
+    travel_times = list(travel_time) if isinstance(travel_time, (list, tuple)) else [travel_time] * (num_bridges - 1)
+    if len(travel_times) != num_bridges - 1:
+        raise ValueError("travel_time must have num_bridges - 1 values")
+    if any(t <= 0 for t in travel_times):
+        raise ValueError("travel times between bridges must be positive")
+    window = min(travel_times) if travel_times else math.inf
+    processes = max(1, min(processes or os.cpu_count() or 1, num_bridges))
+
+    config = {
+        "num_bridges": num_bridges,
+        "travel_times": travel_times,
+        "rate": rate,
+        "num_cars": num_cars,
+        "p_left": p_left,
+        # Оба конца коридора должны видеть один и тот же поток
+        "seed": seed if seed is not None else random.randrange(2 ** 32),
+        "policy": policy,
+        "policy_params": policy_params or {},
+        "capacity": capacity,
+        "headway": headway,
+        "crossing_time": crossing_time,
+    }
+    bounds = [k * num_bridges // processes for k in range(processes + 1)]
+    owner = [k for k in range(processes) for _ in range(bounds[k], bounds[k + 1])]
+
+    connections, workers = [], []
+    finished = False
+    sink, owned_sink = open_sink(output_file, stats)
+    try:
+        if processes == 1:
+            segment = Segment(0, num_bridges, config)
+
+            def exchange(messages):
+                return [segment.step(*messages[0])]
+        else:
+            for k in range(processes):
+                parent, child = multiprocessing.Pipe()
+                worker = multiprocessing.Process(target=segment_worker,
+                                                 args=(child, bounds[k], bounds[k + 1], config))
+                worker.start()
+                child.close()
+                connections.append(parent)
+                workers.append(worker)
+
+            def exchange(messages):
+                # Сначала рассылаем всем, потом собираем: участки считают окно одновременно
+                try:
+                    for conn, message in zip(connections, messages):
+                        conn.send(message)
+                    return [conn.recv() for conn in connections]
+                except (EOFError, BrokenPipeError):
+                    raise RuntimeError("A segment worker exited unexpectedly") from None
+
+        incoming = [[] for _ in range(processes)]
+        next_time = 0.0
+        windows = handoffs = 0
+        while next_time < math.inf:
+            replies = exchange([(next_time + window, incoming[k]) for k in range(processes)])
+            windows += 1
+            incoming = [[] for _ in range(processes)]
+            next_time = math.inf
+            for outgoing, journeys, segment_next in replies:
+                sink.write_many(journeys)
+                next_time = min(next_time, segment_next)
+                for car in outgoing:
+                    incoming[owner[car[0]]].append(car)
+                    next_time = min(next_time, car[3])
+                handoffs += len(outgoing)
+
+        if processes == 1:
+            bridges = segment.summaries()
+        else:
+            bridges = []
+            for conn in connections:
+                conn.send(None)
+            for conn in connections:
+                bridges.extend(conn.recv())
+        finished = True
+    finally:
+        # После ошибки участки ждали бы следующего окна вечно — их завершаем
+        for worker in workers:
+            if not finished and worker.is_alive():
+                worker.terminate()
+            worker.join()
+        for conn in connections:
+            conn.close()
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"Результаты сохранены в {output_file}")
+    return {"bridges": bridges, "windows": windows, "handoffs": handoffs, "processes": processes}
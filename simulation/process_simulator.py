@@ -0,0 +1,103 @@
+# project/simulation/process_simulator.py
+import queue
+import random
+from typing import List
+
+from .records import CarTable, ResultTable
+from .sinks import open_sink
+
+# Как часто (в секундах) главный процесс, ожидая очередь, проверяет, живы ли рабочие
+POLL_INTERVAL = 0.5
+
+
+def car_worker(bridge_instance, car_queue, result_queue):
+    """Процесс-машина: берёт машины из очереди, пока не получит None, и отдаёт все свои результаты разом."""
+    rows = ResultTable()
+    try:
+        while True:
+            car = car_queue.get()
+            if car is None:
+                break
+            car_id, direction, arrival_time = car
+            enter_time = bridge_instance.enter(direction, arrival_time)
+            leave_time = bridge_instance.leave(enter_time)
+            rows.write(car_id, direction, enter_time - arrival_time, leave_time - enter_time, arrival_time)
+    finally:
+        # И при исключении: иначе открытые представления общей памяти мешают процессу завершиться чисто
+        bridge_instance.detach()
+    result_queue.put(rows)
+
+
+def check_workers(workers):
+    """Рабочий, упавший с исключением, уже не отдаст результаты: ждать его бесполезно."""
+    for worker in workers:
+        if worker.exitcode not in (None, 0):
+            raise RuntimeError(f"Car worker {worker.pid} exited with code {worker.exitcode}")
+
+
+def put_checked(car_queue, item, workers):
+    while True:
+        try:
+            car_queue.put(item, timeout=POLL_INTERVAL)
+            return
+        except queue.Full:
+            check_workers(workers)
+
+
+def get_checked(result_queue, workers):
+    while True:
+        try:
+            return result_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            check_workers(workers)
+
+
+def run_process_simulation(bridge_instance, direction_list: List[str], output_file: str, arrival_span: float,
+                           processes: int = 4, stats=None, seed: int = None, arrivals=None):
+    """
+    То же, что run_simulation(threaded=True, workers=processes), но рабочие — процессы,
+    а мост — SharedMemoryBridge, чьё состояние и замок общие для всех процессов.
+    - processes: число процессов-машин
+    - output_file, stats, seed, arrivals: как в run_simulation
+    Машины раздаются через ограниченную очередь в порядке прибытия;
+    результаты собираются в главном процессе после того, как рабочие закончат.
+    Процессы и очереди создаются в контексте моста (bridge_instance.context).
+    Если рабочий упал, прогон прерывается RuntimeError, остальные рабочие завершаются.
+    """
+    sink, owned_sink = open_sink(output_file, stats)
+    workers = []
+    finished = False
+    try:
+        if arrivals is not None:
+            cars = arrivals
+        else:
+            rng = random.Random(seed) if seed is not None else random
+            cars = CarTable.uniform(direction_list, arrival_span, rng)
+
+        context = bridge_instance.context
+        # Как и в пуле потоков, пул не зависнет: направление отдаётся только тому,
+        # у кого есть ожидающая машина, а она и есть процесс, стоящий в enter()
+        car_queue = context.Queue(maxsize=processes * 4)
+        result_queue = context.Queue()
+        workers = [context.Process(target=car_worker, args=(bridge_instance, car_queue, result_queue))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        for car in cars:
+            put_checked(car_queue, car, workers)
+        for _ in workers:
+            put_checked(car_queue, None, workers)
+        # Результаты забираем до join(): процесс с непрочитанными данными в очереди не завершится
+        for _ in workers:
+            sink.write_many(get_checked(result_queue, workers))
+        finished = True
+    finally:
+        # После ошибки оставшиеся рабочие могут ждать в enter() вечно — их завершаем
+        for worker in workers:
+            if not finished and worker.is_alive():
+                worker.terminate()
+            worker.join()
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"Результаты сохранены в {output_file}")
@@ -1,72 +1,250 @@
 # project/simulation/real_simulator.py
-import csv
+import heapq
 import random
-import time
 import threading
+from collections import deque
 from typing import List
 
-def run_real_simulation(bridge_instance, direction_list: List[str], threaded: bool, output_file: str, arrival_span: float):
+from .records import CarTable
+from .resources import ResourceMonitor
+from .sinks import dump_metrics, open_sink
+from .stats import P2Quantile, RunningStats
+
+
+class ArrivalTiming:
+    """
+    Ошибка моментов прибытия: насколько позже расписания машина попала к мосту,
+    в секундах часов моста. Растёт, когда диспетчер не успевает за потоком машин.
+    """
+
+    def __init__(self):
+        self.errors = RunningStats()
+        self.p99 = P2Quantile(0.99)
+
+    def record(self, scheduled: float, actual: float):
+        error = actual - scheduled
+        self.errors.add(error)
+        self.p99.add(error)
+
+    def report(self):
+        count = self.errors.count
+        return {"count": count,
+                "mean": self.errors.mean,
+                "p99": self.p99.value if count else 0.0,
+                "max": self.errors.max if count else 0.0}
+
+
+def timer_heap(cars):
+    """Машины (car_id, direction, delay) в порядке delay: куча, а не полная сортировка списка."""
+    heap = [(delay, car_id, direction) for car_id, direction, delay in cars]
+    heapq.heapify(heap)
+    while heap:
+        delay, car_id, direction = heapq.heappop(heap)
+        yield car_id, direction, delay
+
+
+def run_real_simulation(bridge_instance, direction_list: List[str], threaded: bool, output_file: str, arrival_span: float,
+                        workers: int = None, stats=None, seed: int = None, arrivals=None, tracer=None):
     """
-    Запускает реальную симуляцию с измерением фактического времени.
+    Запускает реальную симуляцию с измерением фактического времени
+    по часам моста (bridge_instance.clock).
     - arrival_span: максимальное случайное время задержки перед началом движения каждой машины
-    - threaded: если True, для каждой машины создаётся поток
+    - threaded: если True, машины обслуживаются потоками
+    - workers: размер пула потоков; None — пул растёт до числа машин, одновременно находящихся у моста
+    - output_file: путь (.csv или .bin), ResultSink или None; результаты пишутся по мере выезда
+    - stats: необязательный OnlineStats (или другой ResultSink), получающий те же записи
+    - seed: зерно генератора времён прибытия; с ним прогон воспроизводим
+    - arrivals: готовый поток машин (car_id, direction, arrival_time) по возрастанию
+      времени (см. simulation.arrivals); arrival_time — задержка от старта прогона.
+      Пул и последовательный режим читают его по одной машине
+    - tracer: ChromeTracer для временной шкалы; по умолчанию — tracer моста, если он есть.
+      Время в трассе отсчитывается от старта прогона
+    В многопоточных режимах машины выпускает к мосту один диспетчер (основной поток):
+    он спит до ближайшего прибытия по расписанию и только тогда отдаёт машину
+    рабочему или запускает её поток, так что живых потоков столько, сколько машин
+    у моста, а не все сразу.
+    Возвращает пиковое число потоков, пиковый RSS процесса и ошибку моментов
+    прибытия (arrival_error: среднее, p99 и максимум опоздания относительно расписания).
     """
-    results = []
-    num_cars = len(direction_list)
+    tracer = tracer or getattr(bridge_instance, "tracer", None)
+    sink, owned_sink = open_sink(output_file, stats, tracer)
+    try:
+        monitor = ResourceMonitor()
+        timing = ArrivalTiming()
+        # Время берём с часов моста, чтобы ускоренные и виртуальные часы работали сквозным образом
+        clock = bridge_instance.clock
+        if tracer is not None:
+            tracer.set_origin(clock.time())
 
-    # Генерируем случайные задержки перед появлением машин
-    arrival_delays = [random.uniform(0, arrival_span) for _ in direction_list]
-    cars = list(zip(range(1, num_cars+1), direction_list, arrival_delays))
+        if arrivals is not None:
+            cars, ordered = arrivals, True
+        else:
+            # Генерируем случайные задержки перед появлением машин
+            rng = random.Random(seed) if seed is not None else random
+            cars, ordered = CarTable.uniform(direction_list, arrival_span, rng, ordered=False), False
 
-    # Для многопоточного режима мы хотим запустить каждую машину в отдельном потоке
-    if threaded:
-        lock_results = threading.Lock()  # чтобы безопасно записывать результаты из потоков
+        # В многопоточном режиме каждую машину ведёт свой поток, пока она у моста
+        if threaded:
+            lock_results = threading.Lock()  # чтобы безопасно записывать результаты из потоков
 
-        def car_thread(car_id: int, direction: str, delay: float):
-            # Ждём "прихода" машины
-            time.sleep(delay)
-            arrival_time = time.time()
+            def drive(car_id: int, direction: str, arrival_time: float):
+                # Заезд на мост (блокирующий вызов enter)
+                enter_time = bridge_instance.enter(direction, arrival_time)
+                wait_time = enter_time - arrival_time
 
-            # Заезд на мост (блокирующий вызов enter)
-            enter_time = bridge_instance.enter(direction, arrival_time)
-            wait_time = enter_time - arrival_time
+                # Выезд с моста
+                leave_time = bridge_instance.leave(enter_time)
+                crossing_time = leave_time - enter_time
 
-            # Выезд с моста
-            leave_time = bridge_instance.leave(enter_time)
-            crossing_time = leave_time - enter_time
+                with lock_results:
+                    sink.write(car_id, direction, wait_time, crossing_time, arrival_time)
+
+            # Машины "приезжают" в основном потоке-диспетчере и ждут свободного рабочего
+            # в очереди, поэтому время в очереди входит во время ожидания.
+            # С workers пул фиксированный; без него пул растёт по требованию:
+            # машина, которой не хватило свободного рабочего, получает новый поток,
+            # а потоки проехавших машин ждут следующих. Живых потоков тогда столько,
+            # сколько машин одновременно у моста, и диспетчер не ждёт запуска потока,
+            # пока есть свободные.
+            # Пул не может зависнуть, даже если все рабочие стоят в enter():
+            # мост отдаёт направление только тому, у кого есть ожидающая машина,
+            # а ожидающая машина — это как раз рабочий поток, припаркованный в enter().
+            # Очередь сделана на условной переменной через часы, чтобы VirtualClock
+            # видел рабочих, ждущих машину, как заблокированных.
+            car_queue = deque()
+            queue_ready = threading.Condition()
+            idle = 0  # рабочие, ждущие машину в очереди
+
+            def worker(car=None):
+                nonlocal idle
+                try:
+                    while True:
+                        if car is None:
+                            with queue_ready:
+                                idle += 1
+                                while not car_queue:
+                                    clock.wait(queue_ready)
+                                idle -= 1
+                                car = car_queue.popleft()
+                            if car is None:
+                                return
+                        drive(*car)
+                        car = None
+                finally:
+                    clock.unregister()
+
+            # Основной поток тоже участник: он спит до прибытия каждой машины
+            clock.register((workers or 0) + 1)
+            threads = [threading.Thread(target=worker) for _ in range(workers or 0)]
+            for t in threads:
+                t.start()
+            monitor.sample()
+
+            try:
+                start = clock.time()
+                for (car_id, direction, delay) in (cars if ordered else timer_heap(cars)):
+                    due = start + delay
+                    clock.sleep(due - clock.time())
+                    arrival_time = clock.time()
+                    timing.record(due, arrival_time)
+                    with queue_ready:
+                        # Свободен ли рабочий, ещё не получивший машину из очереди
+                        spawn = not workers and idle <= len(car_queue)
+                        if not spawn:
+                            car_queue.append((car_id, direction, arrival_time))
+                            clock.notify(queue_ready)
+                    if spawn:
+                        # Регистрируем рабочего до старта: диспетчер ещё активен,
+                        # так что виртуальное время не сдвинется раньше него
+                        clock.register()
+                        t = threading.Thread(target=worker, args=((car_id, direction, arrival_time),))
+                        t.start()
+                        threads.append(t)
+                        monitor.sample()
+                with queue_ready:
+                    car_queue.extend([None] * len(threads))
+                    clock.notify_all(queue_ready)
+            finally:
+                clock.unregister()
+            for t in threads:
+                t.join()
+
+        else:
+            # Последовательно
+            clock.register()
+            try:
+                start = clock.time()
+                for (car_id, direction, delay) in cars:
+                    # Поток прибытий задаёт моменты от старта; старый режим — паузу перед каждой машиной
+                    due = start + delay if ordered else clock.time() + delay
+                    clock.sleep(due - clock.time())
+                    arrival_time = clock.time()
+                    timing.record(due, arrival_time)
 
-            with lock_results:
-                results.append((car_id, direction, wait_time, crossing_time, arrival_time))
+                    enter_time = bridge_instance.enter(direction, arrival_time)
+                    wait_time = enter_time - arrival_time
 
-        threads = []
-        for (car_id, direction, delay) in cars:
-            t = threading.Thread(target=car_thread, args=(car_id, direction, delay))
-            threads.append(t)
+                    leave_time = bridge_instance.leave(enter_time)
+                    crossing_time = leave_time - enter_time
+
+                    sink.write(car_id, direction, wait_time, crossing_time, arrival_time)
+            finally:
+                clock.unregister()
+    finally:
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"REAL simulation results saved to {output_file}")
+    metrics_path = dump_metrics(bridge_instance, output_file)
+    if metrics_path:
+        print(f"Bridge metrics saved to {metrics_path}")
+    usage = monitor.report()
+    usage["arrival_error"] = timing.report()
+    error = usage["arrival_error"]
+    print(f"Peak threads: {usage['peak_threads']}, peak RSS: {usage['peak_rss_mb']:.1f} MB")
+    print(f"Arrival timing error (clock seconds): mean {error['mean']:.4f}, p99 {error['p99']:.4f}, "
+          f"max {error['max']:.4f}")
+    return usage
+
+
+def run_real_simulation_async(bridge_instance, direction_list: List[str], output_file: str, arrival_span: float,
+                              stats=None, seed: int = None, tracer=None):
+    """
+    Реальная симуляция на asyncio: каждая машина — корутина, а не поток.
+    bridge_instance должен быть AsyncBridge (enter/leave — корутины).
+    Все машины живут на одном event loop, поэтому десятки тысяч машин
+    не упираются в лимит потоков процесса. Время берётся с часов моста (bridge_instance.clock).
+    tracer (ChromeTracer; по умолчанию — tracer моста) получает временную шкалу прогона.
+    """
+    import asyncio
 
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+    tracer = tracer or getattr(bridge_instance, "tracer", None)
+    sink, owned_sink = open_sink(output_file, stats, tracer)
+    try:
+        clock = bridge_instance.clock
+        if tracer is not None:
+            tracer.set_origin(clock.time())
+        rng = random.Random(seed) if seed is not None else random
+        cars = CarTable.uniform(direction_list, arrival_span, rng, ordered=False)
 
-    else:
-        # Последовательно
-        for (car_id, direction, delay) in cars:
-            time.sleep(delay)
-            arrival_time = time.time()
+        async def car_task(car_id: int, direction: str, delay: float):
+            await clock.async_sleep(delay)
+            arrival_time = clock.time()
 
-            enter_time = bridge_instance.enter(direction, arrival_time)
+            enter_time = await bridge_instance.enter(direction, arrival_time)
             wait_time = enter_time - arrival_time
 
-            leave_time = bridge_instance.leave(enter_time)
+            leave_time = await bridge_instance.leave(enter_time)
             crossing_time = leave_time - enter_time
 
-            results.append((car_id, direction, wait_time, crossing_time, arrival_time))
+            sink.write(car_id, direction, wait_time, crossing_time, arrival_time)
 
-    # Сохраняем результаты
-    with open(output_file, "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["CarID", "Direction", "WaitingTime", "CrossingTime", "ArrivalTime"])
-        for r in results:
-            writer.writerow(r)
+        async def main():
+            await asyncio.gather(*(car_task(*car) for car in cars))
 
-    print(f"REAL simulation results saved to {output_file}")
+        asyncio.run(main())
+    finally:
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"ASYNC simulation results saved to {output_file}")
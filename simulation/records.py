@@ -0,0 +1,133 @@
+# project/simulation/records.py
+from array import array
+
+from .sinks import DIRECTION_CODES, DIRECTIONS, ResultSink
+
+# Машины и результаты хранятся колонками array, направление — байтом (0 — left, 1 — right).
+# Кортеж (car_id, "left", arrival) в списке занимает около 130 байт на машину,
+# строка таблицы машин — 13 байт, таблицы результатов — 29 байт, как запись бинарного файла.
+# Наружу таблицы отдают те же кортежи со строковым направлением, поэтому
+# симуляторы и приёмники читают их так же, как списки.
+
+
+def sorted_columns(key, *columns):
+    """Переставляет колонки в порядке возрастания key (устойчиво); с NumPy — без списков Python."""
+    try:
+        import numpy as np
+    except ImportError:
+        order = sorted(range(len(key)), key=key.__getitem__)
+        return [array(column.typecode, [column[i] for i in order]) for column in columns]
+    order = np.argsort(np.frombuffer(key, dtype=np.float64), kind="stable")
+    return [array(column.typecode, np.frombuffer(column, dtype=column.typecode)[order].tobytes())
+            for column in columns]
+
+
+class CarTable:
+    """
+    Машины (car_id, direction, arrival_time): car_id — uint32, направление — uint8,
+    время прибытия — float64. Итерация и индексация дают кортежи, как список машин.
+    """
+
+    __slots__ = ("car_ids", "directions", "arrivals")
+
+    def __init__(self):
+        self.car_ids = array("I")
+        self.directions = array("B")
+        self.arrivals = array("d")
+
+    @classmethod
+    def uniform(cls, direction_list, arrival_span: float, rng, ordered: bool = True):
+        """
+        Машины 1..N с направлениями из direction_list и временами прибытия rng.uniform(0, arrival_span),
+        разыгранными в том же порядке, что и раньше в симуляторах, поэтому с тем же seed
+        получаются те же машины. ordered — упорядочить по времени прибытия.
+        """
+        table = cls()
+        table.car_ids = array("I", range(1, len(direction_list) + 1))
+        table.directions = array("B", map(DIRECTION_CODES.__getitem__, direction_list))
+        table.arrivals = array("d", (rng.uniform(0, arrival_span) for _ in direction_list))
+        if ordered:
+            table.sort_by_arrival()
+        return table
+
+    @classmethod
+    def uniform_numpy(cls, direction_list, arrival_span: float, seed=None):
+        """
+        Как uniform(), но времена прибытия разыгрываются одним вызовом np.random.default_rng(seed)
+        и сразу упорядочиваются — без цикла Python по машинам. С тем же seed машины другие,
+        чем у uniform() с random.Random(seed).
+        """
+        import numpy as np
+
+        arrival_times = np.random.default_rng(seed).uniform(0, arrival_span, len(direction_list))
+        table = cls()
+        table.car_ids = array("I", range(1, len(direction_list) + 1))
+        table.directions = array("B", map(DIRECTION_CODES.__getitem__, direction_list))
+        table.arrivals = array("d", arrival_times.tobytes())
+        table.sort_by_arrival()
+        return table
+
+    def direction_names(self):
+        """Направления строками, лениво: "left"/"right" по кодам."""
+        return map(DIRECTIONS.__getitem__, self.directions)
+
+    def append(self, car_id: int, direction: str, arrival_time: float):
+        self.car_ids.append(car_id)
+        self.directions.append(DIRECTION_CODES[direction])
+        self.arrivals.append(arrival_time)
+
+    def sort_by_arrival(self):
+        self.car_ids, self.directions, self.arrivals = sorted_columns(
+            self.arrivals, self.car_ids, self.directions, self.arrivals)
+
+    def sort_by_car(self):
+        key = array("d", self.car_ids)
+        self.car_ids, self.directions, self.arrivals = sorted_columns(
+            key, self.car_ids, self.directions, self.arrivals)
+
+    def __len__(self):
+        return len(self.car_ids)
+
+    def __getitem__(self, i):
+        return self.car_ids[i], DIRECTIONS[self.directions[i]], self.arrivals[i]
+
+    def __iter__(self):
+        return zip(self.car_ids, self.direction_names(), self.arrivals)
+
+
+class ResultTable(ResultSink):
+    """
+    Результаты (car_id, direction, wait, cross, arrival) в колонках array.
+    Это ResultSink: его можно отдать симулятору вместо списка, а потом
+    читать кортежами или колонками (waits, crosses, arrivals) для статистики.
+    """
+
+    def __init__(self):
+        self.car_ids = array("I")
+        self.directions = array("B")
+        self.waits = array("d")
+        self.crosses = array("d")
+        self.arrivals = array("d")
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        self.car_ids.append(car_id)
+        self.directions.append(DIRECTION_CODES[direction])
+        self.waits.append(wait_time)
+        self.crosses.append(crossing_time)
+        self.arrivals.append(arrival_time)
+
+    def sort_by_car(self):
+        key = array("d", self.car_ids)
+        self.car_ids, self.directions, self.waits, self.crosses, self.arrivals = sorted_columns(
+            key, self.car_ids, self.directions, self.waits, self.crosses, self.arrivals)
+
+    def __len__(self):
+        return len(self.car_ids)
+
+    def __getitem__(self, i):
+        return (self.car_ids[i], DIRECTIONS[self.directions[i]], self.waits[i], self.crosses[i],
+                self.arrivals[i])
+
+    def __iter__(self):
+        return zip(self.car_ids, map(DIRECTIONS.__getitem__, self.directions), self.waits, self.crosses,
+                   self.arrivals)
@@ -0,0 +1,33 @@
+# project/simulation/resources.py
+import resource
+import sys
+import threading
+
+
+def peak_rss_mb() -> float:
+    """
+    Пиковый RSS процесса в мегабайтах.
+    ru_maxrss в Linux измеряется в килобайтах, в macOS — в байтах.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class ResourceMonitor:
+    """
+    Следит за пиковым числом живых потоков во время симуляции.
+    sample() дешёвый (threading.active_count), его можно звать на каждую машину.
+    """
+
+    def __init__(self):
+        self.peak_threads = threading.active_count()
+
+    def sample(self):
+        threads = threading.active_count()
+        if threads > self.peak_threads:
+            self.peak_threads = threads
+
+    def report(self):
+        return {"peak_threads": self.peak_threads, "peak_rss_mb": peak_rss_mb()}
@@ -0,0 +1,273 @@
+# project/simulation/scenario.py
+import importlib
+import json
+import os
+import random
+import time
+
+# Сценарий — словарь (обычно из JSON), описывающий один прогон:
+#   {
+#     "name": "multi-event",
+#     "bridge": "multi",                 # см. BRIDGES
+#     "bridge_params": {"batch_size": 5, "capacity": 1, "headway": null, "crossing_time": 1.0},
+#     "policy": "fixed_batch",           # имя из bridge.policies.POLICIES, по желанию
+#     "policy_params": {"batch_size": 5},
+#     "clock": "virtual",                # часы real- и async-мостов: wall, scaled или virtual (async — без virtual)
+#     "time_scale": 100.0,               # для clock = "scaled"
+#     "arrivals": {"process": "uniform", "num_cars": 20000, "arrival_span": 10.0, "p_left": 0.5},
+#     "seed": 42,
+#     "engine": "event",                 # см. ENGINES
+#     "workers": 8,                      # пул потоков или процессов
+#     "output": "multi_threaded_results.csv",  # .csv, .bin или null
+#     "trace": "bridge_trace.json",      # Chrome trace, по желанию
+#     "checkpoint": "run.ckpt",          # контрольная точка для engine sequential или event
+#     "checkpoint_every": 1000000
+#   }
+# Тяжёлые модули (мосты, симуляторы, NumPy, asyncio, multiprocessing) импортируются
+# только при запуске сценария, которому они нужны.
+
+# Мост: имя -> (модуль, класс)
+BRIDGES = {
+    "single": ("bridge.single_threaded", "SingleThreadedBridge"),
+    "multi": ("bridge.multi_threaded", "MultiThreadedBridge"),
+    "shared": ("bridge.shared_memory", "SharedMemoryBridge"),
+    "real_single": ("bridge.real_single_threaded", "RealSingleThreadedBridge"),
+    "real_multi": ("bridge.real_multi_threaded", "RealMultiThreadedBridge"),
+    "async": ("bridge.async_bridge", "AsyncBridge"),
+}
+REAL_BRIDGES = ("real_single", "real_multi", "async")
+# Мосты, которые сами сообщают трассе о партиях; остальным трасса передаётся через симулятор
+TRACED_BRIDGES = ("multi", "real_multi", "async")
+
+ENGINES = ("sequential", "threads", "event", "vectorized", "processes", "real", "real_threads", "async")
+# Движки, которые считают времена прибытия сами и умеют только равномерные прибытия
+UNIFORM_ONLY = ("vectorized", "async")
+
+# Потоки прибытий из simulation.arrivals: имя процесса -> функция
+ARRIVAL_PROCESSES = {
+    "poisson": "poisson_arrivals",
+    "mmpp": "mmpp_arrivals",
+    "diurnal": "diurnal_arrivals",
+}
+
+DEFAULTS = {
+    "bridge": "multi",
+    "bridge_params": {},
+    "policy": None,
+    "policy_params": {},
+    "clock": "wall",
+    "time_scale": 100.0,
+    "arrivals": {"process": "uniform", "num_cars": 1000, "arrival_span": 1000.0},
+    "seed": None,
+    "engine": "event",
+    "workers": None,
+    "output": None,
+    "trace": None,
+    "checkpoint": None,
+    "checkpoint_every": 1_000_000,
+}
+
+
+def load_scenarios(path: str):
+    """
+    Читает сценарии из JSON-файла: один сценарий, список сценариев
+    или {"defaults": {...}, "scenarios": [...]} — тогда defaults общие для всех.
+    Безымянные сценарии называются по файлу и номеру.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    defaults = {}
+    if isinstance(data, dict) and "scenarios" in data:
+        defaults, data = data.get("defaults", {}), data["scenarios"]
+    if isinstance(data, dict):
+        data = [data]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    scenarios = []
+    for i, scenario in enumerate(data):
+        scenario = merge(defaults, scenario)
+        scenario.setdefault("name", stem if len(data) == 1 else f"{stem}#{i + 1}")
+        scenarios.append(scenario)
+    return scenarios
+
+
+def merge(base, override):
+    """
+    Накладывает override на base; вложенные словари (arrivals, bridge_params) сливаются.
+    Прибытия другого процесса заменяют базовые целиком: параметры у процессов разные.
+    Прибытия без process уточняют унаследованный процесс.
+    """
+    result = dict(base)
+    for key, value in override.items():
+        if key == "arrivals" and not isinstance(value, dict):
+            raise ValueError("arrivals must be an object")
+        if key == "arrivals" and isinstance(result.get(key), dict) \
+                and value.get("process", result[key].get("process", "uniform")) \
+                != result[key].get("process", "uniform"):
+            result[key] = value
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = {**result[key], **value}
+        else:
+            result[key] = value
+    return result
+
+
+def resolve(scenario):
+    """Сценарий с заполненными значениями по умолчанию; неизвестные ключи и имена — ValueError."""
+    unknown = set(scenario) - set(DEFAULTS) - {"name"}
+    if unknown:
+        raise ValueError(f"Unknown scenario keys: {', '.join(sorted(unknown))}")
+    arrivals = scenario.get("arrivals", {})
+    if not isinstance(arrivals, dict):
+        raise ValueError("arrivals must be an object")
+    scenario = merge(DEFAULTS, {key: value for key, value in scenario.items() if key != "arrivals"})
+    # Значения по умолчанию есть только у равномерного процесса
+    if arrivals.get("process", "uniform") == "uniform":
+        arrivals = {**DEFAULTS["arrivals"], **arrivals}
+    scenario["arrivals"] = arrivals
+    if scenario["bridge"] not in BRIDGES:
+        raise ValueError(f"Unknown bridge: {scenario['bridge']}")
+    if scenario["engine"] not in ENGINES:
+        raise ValueError(f"Unknown engine: {scenario['engine']}")
+    return scenario
+
+
+def make_bridge(scenario, tracer=None):
+    module, name = BRIDGES[scenario["bridge"]]
+    params = dict(scenario["bridge_params"])
+    if scenario["policy"] is not None:
+        from bridge.policies import make_policy
+        params["policy"] = make_policy(scenario["policy"], **scenario["policy_params"])
+    if scenario["bridge"] in REAL_BRIDGES:
+        params["clock"] = make_clock(scenario)
+    if tracer is not None and scenario["bridge"] in TRACED_BRIDGES:
+        params["tracer"] = tracer
+    return getattr(importlib.import_module(module), name)(**params)
+
+
+def make_clock(scenario):
+    from bridge.clock import ScaledClock, VirtualClock, WallClock
+
+    clock = scenario["clock"]
+    if clock == "wall":
+        return WallClock()
+    if clock == "scaled":
+        return ScaledClock(scenario["time_scale"])
+    if clock == "virtual":
+        return VirtualClock()
+    raise ValueError(f"Unknown clock: {clock}")
+
+
+def make_cars(scenario):
+    """
+    Машины сценария: (direction_list, arrival_span, arrivals).
+    Равномерные прибытия отдаются списком направлений и arrival_span — времена
+    симулятор разыгрывает сам по seed, как в скриптах run_*.py; остальные процессы —
+    ленивым потоком arrivals.
+    """
+    params = dict(scenario["arrivals"])
+    process = params.pop("process", "uniform")
+    seed = scenario["seed"]
+    if process == "uniform":
+        num_cars = params["num_cars"]
+        if params.get("directions") == "alternate":
+            directions = ["left", "right"] * (num_cars // 2) + ["left"] * (num_cars % 2)
+        else:
+            # Направления — из своего потока, не связанного с временами прибытия
+            rng = random.Random(f"directions-{seed}") if seed is not None else random
+            p_left = params.get("p_left", 0.5)
+            directions = [("left" if rng.random() < p_left else "right") for _ in range(num_cars)]
+        return directions, params["arrival_span"], None
+
+    if scenario["engine"] in UNIFORM_ONLY:
+        raise ValueError(f"Engine {scenario['engine']} supports only uniform arrivals")
+    from . import arrivals
+    if process == "replay":
+        return None, None, arrivals.replay_arrivals(params["path"])
+    if process not in ARRIVAL_PROCESSES:
+        raise ValueError(f"Unknown arrival process: {process}")
+    return None, None, getattr(arrivals, ARRIVAL_PROCESSES[process])(seed=seed, **params)
+
+
+def run_scenario(scenario):
+    """
+    Прогоняет один сценарий и возвращает строку таблицы:
+    имя, мост, движок, сводка OnlineStats и время счёта.
+    """
+    from .stats import OnlineStats
+
+    scenario = resolve(scenario)
+    engine = scenario["engine"]
+    directions, arrival_span, cars = make_cars(scenario)
+    tracer = None
+    if scenario["trace"]:
+        if engine == "processes":
+            raise ValueError("Engine processes does not support tracing")
+        from .tracing import ChromeTracer
+        tracer = ChromeTracer(scenario["trace"])
+    bridge = make_bridge(scenario, tracer)
+    stats = OnlineStats()
+    common = {"output_file": scenario["output"], "arrival_span": arrival_span, "stats": stats,
+              "seed": scenario["seed"]}
+    if tracer is not None:
+        common["tracer"] = tracer
+    if scenario["checkpoint"]:
+        if engine not in ("sequential", "event"):
+            raise ValueError(f"Engine {engine} does not support checkpoints")
+        common["checkpoint"] = scenario["checkpoint"]
+        common["checkpoint_every"] = scenario["checkpoint_every"]
+
+    start_time = time.perf_counter()
+    try:
+        if engine in ("sequential", "threads"):
+            from .simulator import run_simulation
+            run_simulation(bridge, directions, engine == "threads", workers=scenario["workers"],
+                           arrivals=cars, **common)
+        elif engine == "event":
+            from .event_simulator import run_event_simulation
+            run_event_simulation(bridge, directions, arrivals=cars, **common)
+        elif engine == "vectorized":
+            from .simulator import run_vectorized_simulation
+            run_vectorized_simulation(bridge, directions, **common)
+        elif engine == "processes":
+            from .process_simulator import run_process_simulation
+            run_process_simulation(bridge, directions, processes=scenario["workers"] or 4, arrivals=cars, **common)
+        elif engine in ("real", "real_threads"):
+            from .real_simulator import run_real_simulation
+            run_real_simulation(bridge, directions, engine == "real_threads", workers=scenario["workers"],
+                                arrivals=cars, **common)
+        else:  # engine == "async"
+            from .real_simulator import run_real_simulation_async
+            run_real_simulation_async(bridge, directions, **common)
+    finally:
+        if hasattr(bridge, "close"):
+            bridge.close()
+        if tracer is not None:
+            tracer.close()
+    elapsed = time.perf_counter() - start_time
+
+    row = {"name": scenario["name"], "bridge": scenario["bridge"], "engine": engine}
+    row.update(stats.summary())
+    row["elapsed"] = elapsed
+    return row
+
+
+def run_scenarios(scenarios, summary_file: str = None):
+    """
+    Прогоняет сценарии один за другим в этом же процессе: интерпретатор
+    и общие модули загружаются один раз на всю пачку.
+    Печатает строку на сценарий; summary_file — CSV со сводками всех сценариев.
+    """
+    # Опечатки в сценариях ловим до первого прогона, а не посреди пачки
+    scenarios = [resolve(scenario) for scenario in scenarios]
+    rows = []
+    for scenario in scenarios:
+        row = run_scenario(scenario)
+        rows.append(row)
+        print(f"{row['name']}: {row['count']} cars, avg wait = {row['avg_wait']:.2f}, "
+              f"max wait = {row['max_wait']:.2f}, throughput = {row['throughput']:.3f} cars/s, "
+              f"{row['elapsed']:.2f} s")
+    if summary_file:
+        from .sweep import write_table
+        write_table(rows, summary_file)
+        print(f"Сводка сохранена в {summary_file}")
+    return rows
@@ -1,46 +1,184 @@
 # project/simulation/simulator.py
-import csv
+import itertools
 import random
+from array import array
 from typing import List
 
+from .checkpoint import bridge_state, clear_checkpoint, load_checkpoint, restore_bridge, restore_stats, run_key, \
+    save_checkpoint
+from .records import CarTable, ResultTable
+from .resources import ResourceMonitor
+from .sinks import dump_metrics, open_sink
 
-def run_simulation(bridge_instance, direction_list: List[str], threaded: bool, output_file: str, arrival_span: float):
-    results = []
-    arrival_times = [random.uniform(0, arrival_span) for _ in direction_list]
-    cars = list(zip(range(1, len(direction_list)+1), direction_list, arrival_times))
-    cars.sort(key=lambda x: x[2])
 
+def run_simulation(bridge_instance, direction_list: List[str], threaded: bool, output_file: str, arrival_span: float,
+                   workers: int = None, stats=None, seed: int = None, arrivals=None, tracer=None,
+                   checkpoint: str = None, checkpoint_every: int = 1_000_000):
+    """
+    - threaded: если True, машины обслуживаются потоками
+    - workers: размер пула потоков; None — по потоку на каждую машину
+    - output_file: путь (.csv или .bin), ResultSink или None; результаты пишутся по мере выезда
+    - stats: необязательный OnlineStats (или другой ResultSink), получающий те же записи
+    - seed: зерно генератора времён прибытия; с ним прогон воспроизводим
+    - arrivals: готовый поток машин (car_id, direction, arrival_time) по возрастанию
+      времени, например из simulation.arrivals; тогда direction_list и arrival_span
+      не нужны, а машины читаются по одной (кроме режима «поток на машину»)
+    - tracer: ChromeTracer для временной шкалы; по умолчанию — tracer моста, если он есть
+    - checkpoint: путь контрольной точки (только threaded=False): каждые checkpoint_every
+      машин туда сохраняются мост, stats и позиция в output_file. Если точка уже есть,
+      прогон продолжается с неё с тем же результатом; после завершения точка удаляется
+    Возвращает пиковое число потоков и пиковый RSS процесса.
+    """
+    state = None
+    if checkpoint is not None:
+        if threaded:
+            raise ValueError("checkpoints need a sequential run (threaded=False)")
+        if tracer is not None or getattr(bridge_instance, "tracer", None) is not None:
+            raise ValueError("checkpoints do not support tracing")
+        key = run_key(bridge_instance, direction_list, arrival_span, seed, arrivals)
+        state = load_checkpoint(checkpoint, key)
+
+    sink, owned_sink = open_sink(output_file, stats, tracer or getattr(bridge_instance, "tracer", None),
+                                 resume_at=state["output_position"] if state is not None else None)
+    try:
+        if arrivals is not None:
+            cars = arrivals
+        else:
+            # seed=None — глобальный random, как раньше; иначе свой генератор на прогон
+            rng = random.Random(seed) if seed is not None else random
+            if state is not None and seed is None:
+                # Без seed времена прибытия повторяются из сохранённого состояния глобального random
+                random.setstate(state["random"])
+            random_state = random.getstate() if seed is None else None
+            cars = CarTable.uniform(direction_list, arrival_span, rng)
+        monitor = ResourceMonitor()
+
+        if threaded:
+            import threading
+            lock_results = threading.Lock()
+
+            fifo = getattr(bridge_instance, "fifo", False)
+            if fifo:
+                if workers:
+                    # Рабочие пула, уснувшие с дальними билетами, могут занять весь пул,
+                    # пока машина с первым билетом ещё стоит в очереди к нему
+                    raise ValueError("fifo admission needs a thread per car, not a worker pool")
+                # Билеты — заранее и по порядку прибытия: мост знает всех, кто приедет,
+                # и пускает их по очереди, какой бы поток ни проснулся первым
+                cars = [(car_id, direction, a_time, bridge_instance.register(direction, a_time))
+                        for car_id, direction, a_time in cars]
+
+            def car_thread(car_id: int, direction: str, arrival_time: float, ticket: int = None):
+                if fifo:
+                    enter_time = bridge_instance.enter(direction, arrival_time, ticket)
+                else:
+                    enter_time = bridge_instance.enter(direction, arrival_time)
+                wait_time = enter_time - arrival_time
+                leave_time = bridge_instance.leave(enter_time)
+                crossing_time = leave_time - enter_time
+                with lock_results:
+                    sink.write(car_id, direction, wait_time, crossing_time, arrival_time)
+
+            if workers:
+                import queue
+                # Пул не может зависнуть, даже если все рабочие стоят в enter():
+                # мост отдаёт направление только тому, у кого есть ожидающая машина,
+                # а ожидающая машина — это как раз рабочий поток, припаркованный в enter().
+                car_queue = queue.Queue(maxsize=workers * 4)
+
+                def worker():
+                    while True:
+                        car = car_queue.get()
+                        if car is None:
+                            return
+                        car_thread(*car)
+
+                threads = [threading.Thread(target=worker) for _ in range(workers)]
+                for t in threads:
+                    t.start()
+                monitor.sample()
+                for car in cars:
+                    car_queue.put(car)
+                for _ in threads:
+                    car_queue.put(None)
+                for t in threads:
+                    t.join()
+            else:
+                threads = [threading.Thread(target=car_thread, args=car) for car in cars]
+
+                for t in threads:
+                    t.start()
+                    monitor.sample()
+                for t in threads:
+                    t.join()
+        else:
+            done = 0
+            if state is not None:
+                done = state["done"]
+                cars = itertools.islice(cars, done, None)
+                restore_bridge(bridge_instance, state["bridge"])
+                restore_stats(stats, state["stats"])
+                print(f"Продолжение с контрольной точки {checkpoint}: {done} машин уже проехало")
+            for (car_id, direction, a_time) in cars:
+                enter_time = bridge_instance.enter(direction, a_time)
+                wait_time = enter_time - a_time
+                leave_time = bridge_instance.leave(enter_time)
+                crossing_time = leave_time - enter_time
+                sink.write(car_id, direction, wait_time, crossing_time, a_time)
+                if checkpoint is not None:
+                    done += 1
+                    if done % checkpoint_every == 0:
+                        save_checkpoint(checkpoint, {
+                            "run_key": key,
+                            "done": done,
+                            "bridge": bridge_state(bridge_instance),
+                            "stats": stats,
+                            "output_position": sink.position(),
+                            "random": random_state if arrivals is None else None,
+                        })
+    finally:
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"Результаты сохранены в {output_file}")
+    if checkpoint is not None:
+        clear_checkpoint(checkpoint)
+    metrics_path = dump_metrics(bridge_instance, output_file)
+    if metrics_path:
+        print(f"Метрики моста сохранены в {metrics_path}")
+    usage = monitor.report()
     if threaded:
-        import threading
-        def car_thread(car_id: int, direction: str, arrival_time: float):
-            enter_time = bridge_instance.enter(direction, arrival_time)
-            wait_time = enter_time - arrival_time
-            leave_time = bridge_instance.leave(enter_time)
-            crossing_time = leave_time - enter_time
-            results.append((car_id, direction, wait_time, crossing_time, arrival_time))
-
-        threads = []
-        for (car_id, direction, a_time) in cars:
-            t = threading.Thread(target=car_thread, args=(car_id, direction, a_time))
-            threads.append(t)
-
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-    else:
-        for (car_id, direction, a_time) in cars:
-            enter_time = bridge_instance.enter(direction, a_time)
-            wait_time = enter_time - a_time
-            leave_time = bridge_instance.leave(enter_time)
-            crossing_time = leave_time - enter_time
-            results.append((car_id, direction, wait_time, crossing_time, a_time))
-
-    # Сохраняем результаты
-    with open(output_file, "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["CarID", "Direction", "WaitingTime", "CrossingTime", "ArrivalTime"])
-        for r in results:
-            writer.writerow(r)
-
-    print(f"Результаты сохранены в {output_file}")
+        print(f"Пик потоков: {usage['peak_threads']}, пиковый RSS: {usage['peak_rss_mb']:.1f} MB")
+    return usage
+
+
+def run_vectorized_simulation(bridge_instance, direction_list: List[str], output_file: str, arrival_span: float,
+                              stats=None, seed: int = None, tracer=None):
+    """
+    То же, что run_simulation(threaded=False) для SingleThreadedBridge,
+    но все машины считаются одним вызовом bridge_instance.cross_batch().
+    Времена прибытия тоже разыгрываются одним вызовом, генератором NumPy
+    np.random.default_rng(seed), поэтому с тем же seed машины не те же,
+    что у run_simulation (там random.Random(seed)).
+    Машины лежат в CarTable; cross_batch читает её колонку прибытий без копирования.
+    """
+    import numpy as np
+
+    cars = CarTable.uniform_numpy(direction_list, arrival_span, seed)
+    arrivals = np.frombuffer(cars.arrivals, dtype=np.float64)
+    enter, wait, leave = bridge_instance.cross_batch(arrivals, cars.direction_names())
+    # Результаты — тоже колонками array, а не списками float: 8 байт на значение вместо 32
+    results = ResultTable()
+    results.car_ids, results.directions, results.arrivals = cars.car_ids, cars.directions, cars.arrivals
+    results.waits = array("d", wait.tobytes())
+    results.crosses = array("d", (leave - enter).tobytes())
+    del enter, wait, leave
+
+    sink, owned_sink = open_sink(output_file, stats, tracer)
+    try:
+        sink.write_many(results)
+    finally:
+        if owned_sink:
+            sink.close()
+    if owned_sink:
+        print(f"Результаты сохранены в {output_file}")
@@ -0,0 +1,245 @@
+# project/simulation/sinks.py
+import csv
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+
+HEADER = ["CarID", "Direction", "WaitingTime", "CrossingTime", "ArrivalTime"]
+
+# Направление в бинарном формате хранится одним байтом
+DIRECTIONS = ("left", "right")
+DIRECTION_CODES = {"left": 0, "right": 1}
+
+# Бинарный формат: 8 байт сигнатуры, затем записи фиксированной длины (29 байт)
+# car_id:uint32, direction:uint8, wait/cross/arrival:float64, little-endian, без выравнивания
+BINARY_MAGIC = b"BRGRES1\n"
+BINARY_RECORD = struct.Struct("<IBddd")
+BINARY_EXTENSIONS = (".bin", ".brg")
+
+
+class ResultSink(ABC):
+    """
+    Приёмник результатов: машины записываются по мере выезда с моста,
+    а не копятся в списке до конца симуляции.
+    """
+
+    @abstractmethod
+    def write(self, car_id: int, direction: str, wait_time: float, crossing_time: float, arrival_time: float):
+        pass
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(*row)
+
+    def position(self):
+        """Сбрасывает буферы и возвращает размер записанного файла в байтах (None, если файла нет)."""
+        return None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(ResultSink):
+    """resume_at — позиция из position(): файл обрезается до неё и дописывается дальше."""
+
+    def __init__(self, path: str, resume_at: int = None):
+        self.path = path
+        if resume_at is None:
+            self.file = open(path, "w", newline='')
+        else:
+            self.file = open(path, "r+", newline='')
+            self.file.seek(resume_at)
+            self.file.truncate()
+        self.writer = csv.writer(self.file)
+        if resume_at is None:
+            self.writer.writerow(HEADER)
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        self.writer.writerow((car_id, direction, wait_time, crossing_time, arrival_time))
+
+    def write_many(self, rows):
+        self.writer.writerows(rows)
+
+    def position(self):
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class BinarySink(ResultSink):
+    """
+    Записи фиксированной длины; файл читается обратно через load_binary_results()
+    как отображённый в память массив NumPy без разбора строк.
+    resume_at — позиция из position(): файл обрезается до неё и дописывается дальше.
+    """
+
+    def __init__(self, path: str, resume_at: int = None):
+        self.path = path
+        if resume_at is None:
+            self.file = open(path, "wb", buffering=1 << 20)
+            self.file.write(BINARY_MAGIC)
+        else:
+            self.file = open(path, "r+b", buffering=1 << 20)
+            self.file.seek(resume_at)
+            self.file.truncate()
+        self.pack = BINARY_RECORD.pack
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        self.file.write(self.pack(car_id, DIRECTION_CODES[direction], wait_time, crossing_time, arrival_time))
+
+    def write_many(self, rows):
+        pack = self.pack
+        codes = DIRECTION_CODES
+        self.file.write(b"".join(pack(c, codes[d], w, x, a) for c, d, w, x, a in rows))
+
+    def position(self):
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class TeeSink(ResultSink):
+    """
+    Раздаёт каждую запись сразу нескольким приёмникам.
+    close() закрывает только приёмники из owned (по умолчанию — все).
+    """
+
+    def __init__(self, *sinks, owned=None):
+        self.sinks = sinks
+        self.owned = sinks if owned is None else owned
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        for sink in self.sinks:
+            sink.write(car_id, direction, wait_time, crossing_time, arrival_time)
+
+    def write_many(self, rows):
+        rows = list(rows)
+        for sink in self.sinks:
+            sink.write_many(rows)
+
+    def position(self):
+        positions = [sink.position() for sink in self.sinks]
+        return next((p for p in positions if p is not None), None)
+
+    def close(self):
+        for sink in self.owned:
+            sink.close()
+
+
+class NullSink(ResultSink):
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        pass
+
+
+def is_binary_file(path: str) -> bool:
+    return str(path).endswith(BINARY_EXTENSIONS)
+
+
+def open_sink(output, stats=None, tracer=None, resume_at=None):
+    """
+    Возвращает (sink, owned). output — путь (формат по расширению: .bin/.brg —
+    бинарный, иначе CSV), готовый ResultSink или None (без файла).
+    stats — дополнительный приёмник (например, OnlineStats), получающий те же записи,
+    tracer — ещё один (ChromeTracer).
+    resume_at — продолжение с контрольной точки: файл по пути output открывается
+    на этой позиции (см. ResultSink.position), а не пишется заново.
+    owned=True, если файл открыт здесь и закрывать его должен вызывающий код.
+    """
+    if output is None:
+        sink, owned = NullSink(), False
+    elif isinstance(output, ResultSink):
+        sink, owned = output, False
+    elif is_binary_file(output):
+        sink, owned = BinarySink(output, resume_at), True
+    else:
+        sink, owned = CsvSink(output, resume_at), True
+
+    extra = [s for s in (stats, tracer) if s is not None]
+    if not extra:
+        return sink, owned
+    if isinstance(sink, NullSink):
+        return (extra[0] if len(extra) == 1 else TeeSink(*extra, owned=())), False
+    # Закрываем только свой файл: stats и tracer остаются у вызывающего кода
+    return TeeSink(sink, *extra, owned=(sink,)), owned
+
+
+def metrics_file(output_file: str) -> str:
+    """results.csv -> results.metrics.json"""
+    return os.path.splitext(str(output_file))[0] + ".metrics.json"
+
+
+def dump_metrics(bridge_instance, output_file):
+    """
+    Сохраняет snapshot() моста рядом с файлом результатов, если мосту
+    передали metrics и результаты пишутся в файл. Возвращает путь или None.
+    """
+    if getattr(bridge_instance, "metrics", None) is None or not isinstance(output_file, (str, os.PathLike)):
+        return None
+    path = metrics_file(output_file)
+    with open(path, "w") as f:
+        json.dump(bridge_instance.snapshot(), f, indent=2)
+    return path
+
+
+def binary_dtype():
+    import numpy as np
+    return np.dtype([("CarID", "<u4"), ("Direction", "u1"), ("WaitingTime", "<f8"),
+                     ("CrossingTime", "<f8"), ("ArrivalTime", "<f8")])
+
+
+def load_binary_results(filename: str):
+    """
+    Отображает бинарный файл результатов в память как структурированный
+    массив NumPy. Колонки доступны как arr["WaitingTime"] и т.д.,
+    направление закодировано числом (0 — left, 1 — right).
+    """
+    import numpy as np
+
+    dtype = binary_dtype()
+    with open(filename, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{filename} is not a bridge results file")
+        f.seek(0, 2)
+        size = f.tell() - len(BINARY_MAGIC)
+    if size == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode="r", offset=len(BINARY_MAGIC), shape=(size // dtype.itemsize,))
+
+
+def load_csv_results(filename: str):
+    """CSV-файл результатов как ResultTable: колонки array вместо кортежа на машину."""
+    from .records import ResultTable
+
+    cars = ResultTable()
+    with open(filename, "r", newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            car_id = int(row["CarID"])
+            direction = row["Direction"]
+            wait = float(row["WaitingTime"])
+            cross = float(row["CrossingTime"])
+            arrival_time = float(row["ArrivalTime"])
+            cars.write(car_id, direction, wait, cross, arrival_time)
+    return cars
+
+
+def load_results(filename: str):
+    """
+    Загружает результаты в любом формате: CSV — ResultTable, которая отдаёт кортежи
+    (car_id, direction, wait, cross, arrival), бинарный — отображённый массив.
+    В обоих случаях c[2] — ожидание, c[3] — проезд, c[4] — прибытие.
+    """
+    if is_binary_file(filename):
+        return load_binary_results(filename)
+    return load_csv_results(filename)
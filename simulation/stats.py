@@ -0,0 +1,179 @@
+# project/simulation/stats.py
+import math
+
+from .sinks import ResultSink
+
+
+class RunningStats:
+    """
+    Количество, среднее и дисперсия по Уэлфорду, минимум и максимум за O(1) памяти.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Потоковая оценка квантиля алгоритмом P² (Jain, Chlamtac, 1985):
+    пять маркеров, O(1) памяти и времени на значение.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+
+        # Ячейка k, в которую попал x, и сдвиг позиций маркеров k+1..4 — без цикла:
+        # add() вызывается на каждую машину, и цикл Python здесь заметен
+        n = self.positions
+        if x < q[1]:
+            if x < q[0]:
+                q[0] = x
+            n[1] += 1
+            n[2] += 1
+            n[3] += 1
+        elif x < q[2]:
+            n[2] += 1
+            n[3] += 1
+        elif x < q[3]:
+            n[3] += 1
+        elif x > q[4]:
+            q[4] = x
+        n[4] += 1
+        # Крайние желаемые позиции не используются: двигаем только средние
+        desired = self.desired
+        increments = self.increments
+        desired[1] += increments[1]
+        desired[2] += increments[2]
+        desired[3] += increments[3]
+
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if d >= 1:
+                if n[i + 1] - n[i] > 1:
+                    self.adjust(i, 1)
+            elif d <= -1:
+                if n[i - 1] - n[i] < -1:
+                    self.adjust(i, -1)
+
+    def adjust(self, i: int, d: int):
+        # Параболическая поправка маркера i, а если она выводит за соседей — линейная
+        q = self.heights
+        n = self.positions
+        qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+        if not q[i - 1] < qp < q[i + 1]:
+            qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+        q[i] = qp
+        n[i] += d
+
+    @property
+    def value(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.count < 5:
+            ordered = sorted(self.heights)
+            return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+        return self.heights[2]
+
+
+class OnlineStats(ResultSink):
+    """
+    Статистика по машинам, считаемая по мере их выезда, без файла и без списка:
+    среднее/дисперсия/максимум ожидания (в целом и по направлениям),
+    потоковые квантили ожидания, общее логическое время симуляции и пропускная способность.
+    Это ResultSink, поэтому его можно передать симулятору как output_file или stats.
+    """
+
+    def __init__(self, quantiles=(0.5, 0.95, 0.99)):
+        self.wait = RunningStats()
+        self.cross = RunningStats()
+        self.by_direction = {"left": RunningStats(), "right": RunningStats()}
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.first_arrival = math.inf
+        self.last_finish = -math.inf
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        self.wait.add(wait_time)
+        self.cross.add(crossing_time)
+        self.by_direction[direction].add(wait_time)
+        for estimator in self.quantiles.values():
+            estimator.add(wait_time)
+        if arrival_time < self.first_arrival:
+            self.first_arrival = arrival_time
+        finish_time = arrival_time + wait_time + crossing_time
+        if finish_time > self.last_finish:
+            self.last_finish = finish_time
+
+    def quantile(self, p: float) -> float:
+        return self.quantiles[p].value
+
+    @property
+    def count(self) -> int:
+        return self.wait.count
+
+    @property
+    def total_time(self) -> float:
+        """(время выезда последней машины) - (минимальное время прибытия)."""
+        return self.last_finish - self.first_arrival if self.count else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Машин в секунду за всё время симуляции; с колонной растёт вместе с capacity."""
+        total_time = self.total_time
+        return self.count / total_time if total_time > 0 else 0.0
+
+    def summary(self):
+        """Плоский словарь метрик, удобный для таблиц и CSV."""
+        result = {
+            "count": self.count,
+            "avg_wait": self.wait.mean,
+            "std_wait": self.wait.std,
+            "max_wait": self.wait.max if self.count else 0.0,
+            "avg_cross": self.cross.mean,
+            "total_time": self.total_time,
+            "throughput": self.throughput,
+        }
+        for p in self.quantiles:
+            result[f"p{round(p * 100):g}_wait"] = self.quantile(p)
+        for direction, stats in self.by_direction.items():
+            result[f"{direction}_count"] = stats.count
+            result[f"{direction}_avg_wait"] = stats.mean
+            result[f"{direction}_max_wait"] = stats.max if stats.count else 0.0
+        return result
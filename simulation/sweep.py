@@ -0,0 +1,121 @@
+# project/simulation/sweep.py
+import csv
+import itertools
+import multiprocessing
+import random
+import time
+
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.single_threaded import SingleThreadedBridge
+
+from .event_simulator import run_event_simulation
+from .simulator import run_simulation
+from .stats import OnlineStats
+
+# Логические движки, которые можно гонять в сетке.
+# "multi" идёт через дискретно-событийный движок: потоки в процессах пула не нужны.
+ENGINES = ("single", "multi")
+# Движки, мосту которых нужен batch_size; у остальных он в сетке всегда None
+BATCHED_ENGINES = ("multi",)
+
+PARAMS = ("engine", "num_cars", "batch_size", "p_left", "arrival_span", "seed")
+
+
+def make_grid(num_cars, batch_size, p_left, arrival_span, seed, engines=ENGINES):
+    """
+    Декартово произведение параметров: список словарей-ячеек.
+    Каждый аргумент — список значений. Для движков вне BATCHED_ENGINES batch_size
+    схлопывается в None: иначе одна и та же ячейка шла бы в таблицу по разу на каждый batch_size.
+    """
+    return [dict(zip(PARAMS, (engine,) + values))
+            for engine in engines
+            for values in itertools.product(num_cars, batch_size if engine in BATCHED_ENGINES else [None],
+                                            p_left, arrival_span, seed)]
+
+
+def run_cell(cell):
+    """
+    Прогоняет одну ячейку сетки и возвращает строку таблицы:
+    параметры ячейки + сводка OnlineStats + время счёта.
+    Направления и времена прибытия берутся из отдельных генераторов,
+    засеянных seed ячейки, поэтому ячейка воспроизводима.
+    """
+    rng = random.Random(f"directions-{cell['seed']}")
+    directions = [("left" if rng.random() < cell["p_left"] else "right") for _ in range(cell["num_cars"])]
+
+    stats = OnlineStats()
+    start_time = time.perf_counter()
+    if cell["engine"] == "single":
+        run_simulation(bridge_instance=SingleThreadedBridge(),
+                       direction_list=directions,
+                       threaded=False,
+                       output_file=None,
+                       arrival_span=cell["arrival_span"],
+                       stats=stats,
+                       seed=cell["seed"])
+    elif cell["engine"] == "multi":
+        run_event_simulation(bridge_instance=MultiThreadedBridge(batch_size=cell["batch_size"]),
+                             direction_list=directions,
+                             output_file=None,
+                             arrival_span=cell["arrival_span"],
+                             stats=stats,
+                             seed=cell["seed"])
+    else:
+        raise ValueError(f"Unknown engine: {cell['engine']}")
+    elapsed = time.perf_counter() - start_time
+
+    row = dict(cell)
+    row.update(stats.summary())
+    row["wall_time"] = elapsed
+    return row
+
+
+def cell_key(cache, cell) -> str:
+    # Однопоточному мосту batch_size безразличен: в кеше он всегда None,
+    # даже для ячеек, собранных не через make_grid()
+    if cell["engine"] == "single":
+        bridge_class, batch_size = "SingleThreadedBridge", None
+    else:
+        bridge_class, batch_size = "MultiThreadedBridge", cell["batch_size"]
+    directions = {"num_cars": cell["num_cars"], "p_left": cell["p_left"]}
+    return cache.key(bridge_class, batch_size, directions, cell["arrival_span"], cell["seed"])
+
+
+def run_sweep(cells, processes: int = None, output_file: str = None, cache=None):
+    """
+    Раздаёт ячейки по пулу процессов (по умолчанию — по числу ядер)
+    и собирает результаты в одну таблицу в исходном порядке ячеек.
+    Если задан cache (ResultCache), уже посчитанные ячейки берутся из него.
+    Если задан output_file, таблица сохраняется в CSV.
+    """
+    rows = [None] * len(cells)
+    todo = []
+    for i, cell in enumerate(cells):
+        cached = cache.get(cell_key(cache, cell)) if cache is not None else None
+        if cached is not None:
+            rows[i] = dict(cell, **cached)
+        else:
+            todo.append(i)
+
+    if todo:
+        with multiprocessing.Pool(processes) as pool:
+            computed = pool.map(run_cell, [cells[i] for i in todo], chunksize=1)
+        for i, row in zip(todo, computed):
+            rows[i] = row
+            if cache is not None:
+                cache.put(cell_key(cache, cells[i]), {k: v for k, v in row.items() if k not in PARAMS})
+    print(f"Sweep: {len(todo)} cells computed, {len(cells) - len(todo)} taken from cache")
+
+    if output_file:
+        write_table(rows, output_file)
+        print(f"Sweep results saved to {output_file}")
+    return rows
+
+
+def write_table(rows, output_file: str):
+    if not rows:
+        return
+    with open(output_file, "w", newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,101 @@
+# project/simulation/tracing.py
+import json
+import threading
+
+from .sinks import ResultSink
+
+# Трасса — один процесс "bridge" с дорожкой состояния моста и дорожкой на направление
+TRACE_PID = 1
+BRIDGE_TRACK = 0
+DIRECTION_TRACKS = {"left": 1, "right": 2}
+
+# Времена в трассе — микросекунды
+TRACE_TIME_SCALE = 1e6
+
+
+class ChromeTracer(ResultSink):
+    """
+    Записывает временную шкалу прогона в формате Chrome trace events (JSON).
+    Такой файл открывают ui.perfetto.dev и chrome://tracing.
+    - Дорожка "bridge" показывает партии: от въезда первой машины партии
+      до выезда последней. Промежутки между партиями — передача моста и простой.
+    - Дорожки "left" и "right": у каждой машины интервал от прибытия до выезда
+      с вложенным проездом "crossing". Часть интервала до проезда — ожидание.
+
+    Машины трассировщик получает как приёмник результатов: симуляторы пишут
+    в него те же записи, что и в файл. Партии сообщает сам мост, если передать
+    ему tracer=. В памяти лежит не больше buffer_size событий,
+    остальное уже дописано в файл, поэтому трасса годится для прогонов
+    на десятки тысяч машин.
+    Времена отсчитываются от origin: у логических симуляторов это 0,
+    реальные ставят момент старта через set_origin().
+    Закрывает трассу тот, кто её создал: close() или with ChromeTracer(...) as tracer.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 65536, origin: float = None):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.origin = origin
+        self.events = 0
+        self.buffer = []
+        # Машины пишут потоки симулятора, партии — потоки внутри моста
+        self.lock = threading.Lock()
+        self.file = open(path, "w")
+        self.file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self.first = True
+
+        self.emit({"name": "process_name", "ph": "M", "pid": TRACE_PID, "args": {"name": "bridge"}})
+        for name, track in [("bridge", BRIDGE_TRACK)] + list(DIRECTION_TRACKS.items()):
+            self.emit({"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": track, "args": {"name": name}},
+                      {"name": "thread_sort_index", "ph": "M", "pid": TRACE_PID, "tid": track,
+                       "args": {"sort_index": track}})
+
+    def set_origin(self, origin: float):
+        """Задаёт точку отсчёта, если её ещё нет."""
+        if self.origin is None:
+            self.origin = origin
+
+    def ts(self, t: float) -> float:
+        return (t - (self.origin or 0.0)) * TRACE_TIME_SCALE
+
+    def write(self, car_id, direction, wait_time, crossing_time, arrival_time):
+        enter_time = arrival_time + wait_time
+        leave_time = enter_time + crossing_time
+        # Асинхронные события (b/e) могут перекрываться: машины одного направления
+        # ждут одновременно, а в колонне ещё и едут одновременно
+        car = {"cat": "car", "id": car_id, "pid": TRACE_PID, "tid": DIRECTION_TRACKS[direction]}
+        self.emit(
+            dict(car, name=direction, ph="b", ts=self.ts(arrival_time), args={"car": car_id, "wait": wait_time}),
+            dict(car, name="crossing", ph="b", ts=self.ts(enter_time)),
+            dict(car, name="crossing", ph="e", ts=self.ts(leave_time)),
+            dict(car, name=direction, ph="e", ts=self.ts(leave_time)),
+        )
+
+    def batch(self, direction: str, start: float, end: float, cars: int):
+        """Партия машин direction: въезд первой в start, выезд последней в end."""
+        self.emit({"name": direction, "cat": "batch", "ph": "X", "pid": TRACE_PID, "tid": BRIDGE_TRACK,
+                   "ts": self.ts(start), "dur": (end - start) * TRACE_TIME_SCALE, "args": {"cars": cars}})
+
+    def emit(self, *events):
+        with self.lock:
+            self.buffer.extend(events)
+            self.events += len(events)
+            if len(self.buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        # Вызывается под self.lock
+        if not self.buffer:
+            return
+        text = ",\n".join(json.dumps(event, separators=(",", ":")) for event in self.buffer)
+        self.file.write(text if self.first else ",\n" + text)
+        self.first = False
+        self.buffer.clear()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self._flush()
+            self.file.write("\n]}\n")
+            self.file.close()
@@ -0,0 +1,133 @@
+# project/simulation/tuner.py
+import itertools
+import math
+import multiprocessing
+import random
+
+from bridge.multi_threaded import MultiThreadedBridge
+from bridge.policies import make_policy
+
+from .event_simulator import run_event_simulation
+from .stats import OnlineStats, RunningStats
+
+
+def mean_wait(summary, fairness_weight):
+    return summary["avg_wait"]
+
+
+def p99_wait(summary, fairness_weight):
+    return summary["p99_wait"]
+
+
+def fair_wait(summary, fairness_weight):
+    """Среднее ожидание плюс штраф за перекос средних ожиданий между сторонами."""
+    return summary["avg_wait"] + fairness_weight * abs(summary["left_avg_wait"] - summary["right_avg_wait"])
+
+
+# Целевые функции (меньше — лучше)
+OBJECTIVES = {
+    "mean_wait": mean_wait,
+    "p99_wait": p99_wait,
+    "fair_wait": fair_wait,
+}
+
+# Двусторонние 95% квантили распределения Стьюдента по числу степеней свободы
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980}
+
+
+def t_critical(df: int) -> float:
+    # Для df между узлами таблицы берём ближайший меньший узел: интервал чуть шире, но не уже
+    if df < 1:
+        return math.inf
+    return T_95[max(k for k in T_95 if k <= df)] if df <= 120 else 1.960
+
+
+def confidence_interval(values):
+    """Среднее и 95% доверительный интервал (t-интервал) по независимым повторам."""
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    half_width = t_critical(stats.count - 1) * stats.std / math.sqrt(stats.count) if stats.count else math.inf
+    return stats.mean, (stats.mean - half_width, stats.mean + half_width)
+
+
+def run_replication(task):
+    """
+    Один прогон дискретно-событийного движка для набора параметров политики.
+    Возвращает сводку OnlineStats. Функция верхнего уровня, чтобы её можно было отдать в пул.
+    """
+    policy, params, profile, seed = task
+    rng = random.Random(f"directions-{seed}")
+    directions = [("left" if rng.random() < profile["p_left"] else "right") for _ in range(profile["num_cars"])]
+
+    stats = OnlineStats()
+    bridge = MultiThreadedBridge(policy=make_policy(policy, **params),
+                                 capacity=profile.get("capacity", 1),
+                                 headway=profile.get("headway"))
+    run_event_simulation(bridge_instance=bridge,
+                         direction_list=directions,
+                         output_file=None,
+                         arrival_span=profile["arrival_span"],
+                         stats=stats,
+                         seed=seed)
+    return stats.summary()
+
+
+def tune(profile, space, policy: str = "fixed_batch", objective: str = "mean_wait",
+         replications: int = 10, fairness_weight: float = 1.0, base_seed: int = 0, processes: int = None):
+    """
+    Подбирает параметры политики переключения под профиль прибытия.
+
+    profile — {"num_cars": ..., "p_left": ..., "arrival_span": ...}, при желании
+    с "capacity" и "headway" моста;
+    space — значения параметров политики, например {"batch_size": [1, 2, 5, 10, 20]};
+    перебирается их декартово произведение.
+
+    Каждый кандидат прогоняется replications раз (не меньше двух) на одних и тех же зёрнах
+    (общие случайные числа), поэтому кандидатов можно сравнивать попарно.
+    Возвращает словарь: лучшие параметры, среднее значение цели с 95% интервалом,
+    интервал для разницы с ближайшим соперником и таблицу по всем кандидатам.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    if replications < 2:
+        # По одному повтору разброс не оценить: интервалы вышли бы nan
+        raise ValueError("replications must be at least 2")
+    score = OBJECTIVES[objective]
+
+    names = list(space)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    seeds = [base_seed + r for r in range(replications)]
+    tasks = [(policy, params, profile, seed) for params in candidates for seed in seeds]
+
+    with multiprocessing.Pool(processes) as pool:
+        summaries = pool.map(run_replication, tasks, chunksize=1)
+
+    scores = [[score(summaries[i * replications + r], fairness_weight) for r in range(replications)]
+              for i in range(len(candidates))]
+    table = []
+    for params, values in zip(candidates, scores):
+        mean, (low, high) = confidence_interval(values)
+        table.append({"params": params, "mean": mean, "ci_low": low, "ci_high": high, "scores": values})
+    table.sort(key=lambda row: row["mean"])
+
+    best = table[0]
+    result = {
+        "policy": policy,
+        "objective": objective,
+        "params": best["params"],
+        "mean": best["mean"],
+        "ci": (best["ci_low"], best["ci_high"]),
+        "replications": replications,
+        "runner_up": None,
+        "diff_ci": None,
+        "candidates": table,
+    }
+    if len(table) > 1:
+        # Парная разница с тем же зерном: интервал, не содержащий 0, значит, что победа не случайна
+        runner_up = table[1]
+        _, diff_ci = confidence_interval([b - a for a, b in zip(best["scores"], runner_up["scores"])])
+        result["runner_up"] = runner_up["params"]
+        result["diff_ci"] = diff_ci
+    return result
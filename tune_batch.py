@@ -0,0 +1,24 @@
+# project/tune_batch.py
+# Подбор batch_size (и параметров других политик) под профиль трафика
+from simulation.tuner import tune
+
+if __name__ == "__main__":
+    # Профиль трафика: поменялся поток машин — поменяйте профиль и перезапустите
+    profile = {"num_cars": 20000, "p_left": 0.5, "arrival_span": 24000.0}
+
+    searches = [
+        ("fixed_batch", {"batch_size": [1, 2, 3, 5, 8, 13, 20]}),
+        ("time_slice", {"time_slice": [2.0, 5.0, 10.0, 20.0]}),
+        ("oldest_waiter", {"max_age": [2.0, 5.0, 10.0, 20.0]}),
+    ]
+
+    for objective in ("mean_wait", "p99_wait", "fair_wait"):
+        for policy, space in searches:
+            result = tune(profile, space, policy=policy, objective=objective, replications=10)
+            low, high = result["ci"]
+            line = (f"{objective:9} {policy:13} best {result['params']}: "
+                    f"{result['mean']:.3f} [{low:.3f}, {high:.3f}]")
+            if result["runner_up"] is not None:
+                diff_low, diff_high = result["diff_ci"]
+                line += f", ahead of {result['runner_up']} by [{diff_low:.3f}, {diff_high:.3f}]"
+            print(line)